@@ -1,53 +1,75 @@
-from grid import Grid
-from PySide6.QtWidgets import QApplication, QMainWindow, QGraphicsScene, QGraphicsView, QToolBar
-from typing import List
-from PySide6.QtGui import QAction
-
-# get the game from a text file
-with open('sudoku_game.txt', 'r') as sudoku_file:
-    # create a new variable as a list of the game (element 0) and the solution (element 1)
-    sudoku_game: List[str] = sudoku_file.readlines()
-
-# remove the newline character at the end of each element in the list (left over from readline method)
-sudoku_game = list(map(str.strip, sudoku_game))
-
-# create the QApplication to display the sudoku board
-sudoku_app = QApplication([])
-# create the MainWindow
-main_window = QMainWindow()
-# resize the window to display large enough for the grid upon launch
-main_window.resize(700, 700)
-# rename the window
-main_window.setWindowTitle('Sudoku Game')
-# create the main widget
-main_widget = QGraphicsView(main_window)
-# add a toolbar to the main widget for the 'next' button
-toolbar: QToolBar = QToolBar(main_window)
-# add the toolbar to the main window
-main_window.addToolBar(toolbar)
-# create the button and make it belong to the toolbar
-button: QAction = QAction(toolbar)
-# set the text for the button
-button.setText('Solve')
-# add the button to the toolbar
-toolbar.addAction(button)
-# make the main widget the 'central' widget
-main_window.setCentralWidget(main_widget)
-# create the object that contains the graphical components of the sudoku
-main_scene = QGraphicsScene(main_window)
-# tell the widget that the scene exists
-main_widget.setScene(main_scene)
-
-# instantiate the tougher sudoku
-tougher_grid = Grid(sudoku_game[13], sudoku_game[14])
-# call in general solver
-button.triggered.connect(tougher_grid.on_next_button_clicked)
-
-# add the grid to the scene
-main_scene.addItem(tougher_grid)
-
-# show the main window
-main_window.show()
-# execute the app code
-sudoku_app.exec()
-
+from grid import Grid
+from PySide6.QtWidgets import QApplication, QMainWindow, QGraphicsScene, QGraphicsView, QToolBar
+from typing import List
+from PySide6.QtGui import QAction
+
+# get the game from a text file
+with open('sudoku_game.txt', 'r') as sudoku_file:
+    # create a new variable as a list of the game (element 0) and the solution (element 1)
+    sudoku_game: List[str] = sudoku_file.readlines()
+
+# remove the newline character at the end of each element in the list (left over from readline method)
+sudoku_game = list(map(str.strip, sudoku_game))
+
+# create the QApplication to display the sudoku board
+sudoku_app = QApplication([])
+# create the MainWindow
+main_window = QMainWindow()
+# resize the window to display large enough for the grid upon launch
+main_window.resize(700, 700)
+# rename the window
+main_window.setWindowTitle('Sudoku Game')
+# create the main widget
+main_widget = QGraphicsView(main_window)
+# add a toolbar to the main widget for the 'next' button
+toolbar: QToolBar = QToolBar(main_window)
+# add the toolbar to the main window
+main_window.addToolBar(toolbar)
+# create the buttons to step back, step forward, and jump to the end of the solve, and make them belong to the toolbar
+prev_button: QAction = QAction(toolbar)
+next_button: QAction = QAction(toolbar)
+button: QAction = QAction(toolbar)
+# create the button to undo the last change shown, and the button to cancel a solve running in the background
+undo_button: QAction = QAction(toolbar)
+cancel_button: QAction = QAction(toolbar)
+# set the text for the buttons
+prev_button.setText('Prev')
+next_button.setText('Next')
+button.setText('Solve')
+undo_button.setText('Undo')
+cancel_button.setText('Cancel')
+# add the buttons to the toolbar
+toolbar.addAction(prev_button)
+toolbar.addAction(next_button)
+toolbar.addAction(button)
+toolbar.addAction(undo_button)
+toolbar.addAction(cancel_button)
+# make the main widget the 'central' widget
+main_window.setCentralWidget(main_widget)
+# create the object that contains the graphical components of the sudoku
+main_scene = QGraphicsScene(main_window)
+# tell the widget that the scene exists
+main_widget.setScene(main_scene)
+
+# instantiate the tougher sudoku
+tougher_grid = Grid(sudoku_game[13], sudoku_game[14])
+# call in general solver, or replay the solve one step at a time
+button.triggered.connect(tougher_grid.on_solve_button_clicked)
+next_button.triggered.connect(tougher_grid.on_next_button_clicked)
+prev_button.triggered.connect(tougher_grid.on_prev_button_clicked)
+undo_button.triggered.connect(tougher_grid.on_undo_button_clicked)
+cancel_button.triggered.connect(tougher_grid.on_cancel_button_clicked)
+# show the progress and the end of a background solve in the status bar
+tougher_grid.progress_callback = lambda steps, technique: \
+    main_window.statusBar().showMessage(f'Solving... step {steps}: {technique}')
+tougher_grid.finished_callback = lambda status, solved: \
+    main_window.statusBar().showMessage(f'Solve {status}, ' + ('solved' if solved else 'not solved'))
+
+# add the grid to the scene
+main_scene.addItem(tougher_grid)
+
+# show the main window
+main_window.show()
+# execute the app code
+sudoku_app.exec()
+
@@ -0,0 +1,103 @@
+# This file contains the vectorized propagation that runs the single candidate techniques on many boards at once
+from typing import List, Tuple
+import numpy as np
+from board import ALL_CANDIDATES, DIGIT_MASKS, MASK_CANDIDATES, MASK_SIZES, Board
+from houses import CELL_HOUSES, HOUSES
+
+# create the array versions of the house tables for indexing whole batches
+HOUSE_CELLS: np.ndarray = np.array(HOUSES, dtype=np.intp)
+CELL_HOUSE_NUMBERS: np.ndarray = np.array(CELL_HOUSES, dtype=np.intp)
+# create the lookup tables from a 9 bit mask to its number of candidates and to its lowest candidate (0 for no candidate)
+MASK_SIZE_TABLE: np.ndarray = np.array(MASK_SIZES, dtype=np.uint8)
+MASK_DIGIT_TABLE: np.ndarray = np.array([candidates[0] if candidates else 0 for candidates in MASK_CANDIDATES],
+                                        dtype=np.uint8)
+# create the lookup table from a digit (0 - 9) to its bit mask (0 for no digit)
+DIGIT_MASK_TABLE: np.ndarray = np.array(DIGIT_MASKS, dtype=np.uint16)
+# create the bit masks of the 9 candidates, for splitting a mask array into a boolean candidate tensor
+CANDIDATE_BITS: np.ndarray = np.array(DIGIT_MASKS[1:], dtype=np.uint16)
+
+
+# define a function that converts a list of 81 character puzzles into an (N, 81) array of digits (0 for blank cells)
+def puzzles_to_array(puzzles: List[str]) -> np.ndarray:
+    _text: np.ndarray = np.frombuffer(''.join(puzzles).replace('.', '0').encode('ascii'), dtype=np.uint8)
+    return (_text - ord('0')).reshape(len(puzzles), 81)
+
+
+# define a function that removes every placed digit from the candidates of its peers, for the whole batch
+def peer_eliminate(masks: np.ndarray, solutions: np.ndarray):
+    # create the mask of the digits placed in each of the 27 houses of every board
+    _placed: np.ndarray = DIGIT_MASK_TABLE[solutions]
+    _house_placed: np.ndarray = np.bitwise_or.reduce(_placed[:, HOUSE_CELLS], axis=2)
+    # combine the 3 houses of every cell and remove them from its candidates
+    _seen: np.ndarray = np.bitwise_or.reduce(_house_placed[:, CELL_HOUSE_NUMBERS], axis=2)
+    masks &= ~_seen
+    # solved cells have no candidates
+    masks[solutions > 0] = 0
+
+
+# define a function that places every naked single of the batch, returns which boards had any placed
+def naked_singles_place(masks: np.ndarray, solutions: np.ndarray) -> np.ndarray:
+    _singles: np.ndarray = MASK_SIZE_TABLE[masks] == 1
+    solutions[_singles] = MASK_DIGIT_TABLE[masks[_singles]]
+    masks[_singles] = 0
+    return _singles.any(axis=1)
+
+
+# define a function that places every hidden single (a candidate in only one cell of a house),
+# returns which boards had any placed
+def hidden_singles_place(masks: np.ndarray, solutions: np.ndarray) -> np.ndarray:
+    # create the (N, 81, 9) boolean candidate tensor and group it by house into (N, 27, 9, 9)
+    _candidates: np.ndarray = (masks[:, :, None] & CANDIDATE_BITS) != 0
+    _house_candidates: np.ndarray = _candidates[:, HOUSE_CELLS]
+    # find every (board, house, digit) where the digit is a candidate of exactly one cell of the house
+    _lone: np.ndarray = _house_candidates.sum(axis=2) == 1
+    _boards, _houses, _digits = np.nonzero(_lone)
+    # find the position of that cell in the house, then its cell index
+    _positions: np.ndarray = _house_candidates[_boards, _houses, :, _digits].argmax(axis=1)
+    _cells: np.ndarray = HOUSE_CELLS[_houses, _positions]
+    solutions[_boards, _cells] = _digits + 1
+    masks[_boards, _cells] = 0
+    return _lone.any(axis=(1, 2))
+
+
+# define a function that propagates peer elimination, naked singles, and hidden singles to a fixpoint on every board
+# returns the (N, 81) solution digits (0 for unsolved cells) and the (N, 81) candidate masks
+def batch_propagate(puzzles: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    _solutions: np.ndarray = puzzles_to_array(puzzles)
+    _masks: np.ndarray = np.full(_solutions.shape, ALL_CANDIDATES, dtype=np.uint16)
+    # create the indexes of the boards still changing, only those are worked on in each pass
+    _active: np.ndarray = np.arange(len(puzzles))
+    while _active.size:
+        _active_masks: np.ndarray = _masks[_active]
+        _active_solutions: np.ndarray = _solutions[_active]
+        peer_eliminate(_active_masks, _active_solutions)
+        # naked singles first, then hidden singles on the boards that had no naked single
+        _changed: np.ndarray = naked_singles_place(_active_masks, _active_solutions)
+        if not _changed.all():
+            _unchanged: np.ndarray = np.flatnonzero(~_changed)
+            _hidden_masks: np.ndarray = _active_masks[_unchanged]
+            _hidden_solutions: np.ndarray = _active_solutions[_unchanged]
+            _changed[_unchanged] = hidden_singles_place(_hidden_masks, _hidden_solutions)
+            _active_masks[_unchanged] = _hidden_masks
+            _active_solutions[_unchanged] = _hidden_solutions
+        # write the pass back and keep only the boards that changed
+        _masks[_active] = _active_masks
+        _solutions[_active] = _active_solutions
+        _active = _active[_changed]
+    # the last pass placed digits without removing them from their peers
+    peer_eliminate(_masks, _solutions)
+    return _solutions, _masks
+
+
+# define a function that checks which boards are solved without breaking the rules (every house holds every digit)
+def solutions_valid(solutions: np.ndarray) -> np.ndarray:
+    return (np.sort(solutions[:, HOUSE_CELLS], axis=2) == np.arange(1, 10)).all(axis=(1, 2))
+
+
+# define a function that creates a board from a puzzle and its propagated solution digits and candidate masks,
+# so the boards still unsolved can go on to the technique ladder without redoing the propagation
+def board_from_propagated(puzzle: str, solution: np.ndarray, masks: np.ndarray) -> Board:
+    _board: Board = Board('0' * 81)
+    _board.state_load(masks.tolist(), solution.tolist(),
+                      [0 if character == '.' else int(character) for character in puzzle])
+    return _board
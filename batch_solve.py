@@ -0,0 +1,427 @@
+# This file contains the headless command line entry point that streams puzzle corpora through the solver
+import argparse
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Deque, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+from board import Board
+from search import NO_SOLUTION, SOLVED_BY_LOGIC, SOLVED_BY_SEARCH, complete_solve, count_string, \
+    solution_conflicts, solutions_count
+from solve_cache import CacheCounters, CanonicalForm, SolveCache, canonical_form
+from stats import SolveStats
+
+# the characters allowed in a puzzle ('0' and '.' are blank cells)
+PUZZLE_CHARACTERS: frozenset = frozenset('0123456789.')
+
+
+# define a function that checks whether a piece of text is an 81 character puzzle
+def is_puzzle(text: str) -> bool:
+    return len(text) == 81 and PUZZLE_CHARACTERS.issuperset(text)
+
+
+# define a generator that streams (puzzle, solution) pairs from a text stream, one line at a time
+# a line holds a puzzle and an optional solution column separated by whitespace or a comma
+# a completely filled line right after a puzzle line is read as its solution (the layout of sudoku_game.txt)
+# any other lines (titles, comments, blank lines) are skipped
+def puzzle_read(stream: TextIO) -> Iterator[Tuple[str, str]]:
+    # create a variable for a puzzle that is still waiting to see if the next line is its solution
+    _pending_puzzle: Optional[str] = None
+    for line in stream:
+        _columns: List[str] = line.replace(',', ' ').split()
+        # check if the line is a solution to the pending puzzle
+        if _pending_puzzle is not None:
+            if len(_columns) == 1 and is_puzzle(_columns[0]) and '0' not in _columns[0] and '.' not in _columns[0]:
+                yield _pending_puzzle, _columns[0]
+                _pending_puzzle = None
+                continue
+            # otherwise the pending puzzle has no solution
+            yield _pending_puzzle, ''
+            _pending_puzzle = None
+        # skip any line that does not start with a puzzle
+        if not _columns or not is_puzzle(_columns[0]):
+            continue
+        # a puzzle with a solution column is complete
+        if len(_columns) > 1 and is_puzzle(_columns[1]):
+            yield _columns[0], _columns[1]
+        else:
+            _pending_puzzle = _columns[0]
+    # the last puzzle of the stream has no solution after it
+    if _pending_puzzle is not None:
+        yield _pending_puzzle, ''
+
+
+# the status of a puzzle the techniques could not finish when search is turned off
+STALLED: str = 'stalled'
+# the status of a puzzle the uniqueness check rejected for having more than 1 solution
+MULTIPLE_SOLUTIONS: str = 'multiple'
+# the status written for each way a puzzle can be finished
+METHOD_STATUSES: dict = {SOLVED_BY_LOGIC: 'solved', SOLVED_BY_SEARCH: 'searched', NO_SOLUTION: 'invalid',
+                         STALLED: 'stalled', MULTIPLE_SOLUTIONS: 'multiple'}
+
+
+class SolveOptions(NamedTuple):
+    # leave puzzles the techniques stall on unsolved instead of finishing them by search
+    logic_only: bool = False
+    # propagate the single candidate techniques on each whole chunk with NumPy first
+    vectorized: bool = False
+    # collect the per technique statistics of every puzzle
+    collect_stats: bool = False
+    # the number of solves the canonical form cache keeps in memory (0 turns the cache off, unless it has a file)
+    cache_size: int = 0
+    # the SQLite file that keeps the cached solves across runs, None to keep them in memory only
+    cache_path: Optional[str] = None
+    # count the solutions of every puzzle first, rejecting puzzles with no solution or more than 1 before solving
+    check_unique: bool = False
+
+
+# the canonical form cache of this process (every worker process has its own, sharing the same file)
+_process_cache: Optional[SolveCache] = None
+
+
+# define a function that returns the cache of this process, creating it the first time, None if the cache is off
+def process_cache(options: SolveOptions) -> Optional[SolveCache]:
+    global _process_cache
+    if not options.cache_size and options.cache_path is None:
+        return None
+    if _process_cache is None:
+        _process_cache = SolveCache(options.cache_size or 100000, options.cache_path)
+    return _process_cache
+
+
+# define a function that solves a single puzzle headlessly through the technique ladder
+# unless logic only is set, search finishes any puzzle the techniques stall on
+# returns the solution string (0 for unsolved cells) and how the puzzle was finished (logic, search, none, stalled)
+def puzzle_solve(puzzle: str, logic_only: bool = False) -> Tuple[str, str]:
+    return board_solve(Board(puzzle), logic_only)
+
+
+# define a function that solves a board that has already been created
+def board_solve(board: Board, logic_only: bool = False) -> Tuple[str, str]:
+    if logic_only:
+        # givens that break the rules have no solution, whether or not the techniques filled the grid
+        _solved: bool = board.general_solver()
+        _method: str = NO_SOLUTION if solution_conflicts(board) else SOLVED_BY_LOGIC if _solved else STALLED
+    else:
+        _method: str = complete_solve(board)
+    return board.solution_string(), _method
+
+
+# define a function that solves a chunk, returns the solution string, how the puzzle was finished, and the solve time
+# of every puzzle in order, the statistics of the whole chunk (None unless they are collected), and the cache counters
+# of the chunk (None unless the cache is on)
+# with the uniqueness check on, puzzles with no solution or more than 1 are rejected before anything else
+# with the cache on, puzzles equivalent to one already solved are answered from the cache, and only the others are
+# solved (and then stored)
+# with the vectorized option, the single candidate techniques are first propagated on the whole chunk at once
+# (with NumPy), so only the boards that are still unsolved go on to the per puzzle technique ladder
+def chunk_solve(puzzles: List[str], options: SolveOptions = SolveOptions()) -> \
+        Tuple[List[Tuple[str, str, float]], Optional[SolveStats], Optional[CacheCounters]]:
+    _chunk_stats: Optional[SolveStats] = SolveStats() if options.collect_stats else None
+    _results: List[Optional[Tuple[str, str, float]]] = [None] * len(puzzles)
+    # reject the puzzles without exactly 1 solution first (their solution string is just the givens)
+    if options.check_unique:
+        for position, puzzle in enumerate(puzzles):
+            _start: float = time.perf_counter()
+            _board: Board = Board(puzzle)
+            _count: int = solutions_count(_board)
+            if _count != 1:
+                _results[position] = (_board.solution_string(), NO_SOLUTION if _count == 0 else MULTIPLE_SOLUTIONS,
+                                      time.perf_counter() - _start)
+                if _chunk_stats is not None:
+                    _chunk_stats.puzzles += 1
+    # look every other puzzle up in the cache, counting the lookups of this chunk only
+    _cache: Optional[SolveCache] = process_cache(options)
+    _cache_counters: Optional[CacheCounters] = None
+    _forms: List[Optional[CanonicalForm]] = [None] * len(puzzles)
+    if _cache is not None:
+        _cache_counters = _cache.counters = CacheCounters()
+        # a solve that needed search can't answer a puzzle when search is turned off
+        _methods: Tuple[str, ...] = (SOLVED_BY_LOGIC,) if options.logic_only else \
+            (SOLVED_BY_LOGIC, SOLVED_BY_SEARCH, NO_SOLUTION)
+        for position, puzzle in enumerate(puzzles):
+            if _results[position] is not None:
+                continue
+            _start = time.perf_counter()
+            _forms[position] = canonical_form(puzzle)
+            if _forms[position] is not None:
+                _entry = _cache.lookup(_forms[position], _methods)
+                if _entry is not None:
+                    _results[position] = (_entry.solution, _entry.method, time.perf_counter() - _start)
+                    if _chunk_stats is not None:
+                        _chunk_stats.puzzles += 1
+    _positions: List[int] = [position for position, result in enumerate(_results) if result is None]
+    if not _positions:
+        return _results, _chunk_stats, _cache_counters
+    _misses: List[str] = [puzzles[position] for position in _positions]
+    # create the boards lazily (or the solutions of boards already solved by vectorized propagation)
+    if options.vectorized:
+        # NumPy is only needed for the vectorized mode, so it is imported here
+        from batch_propagate import batch_propagate, board_from_propagated, solutions_valid
+        _start = time.perf_counter()
+        _solutions, _masks = batch_propagate(_misses)
+        # a filled board is only solved if it keeps the rules, the others (such as givens with a duplicate digit) go on
+        # to the technique ladder, which finds they have no solution
+        _valid = solutions_valid(_solutions)
+        # share the time of the batch propagation evenly between the puzzles
+        _shared_time: float = (time.perf_counter() - _start) / len(_misses)
+        _boards: Iterator = (''.join(map(str, solution.tolist())) if valid
+                             else board_from_propagated(puzzle, solution, masks)
+                             for puzzle, solution, masks, valid in zip(_misses, _solutions, _masks, _valid))
+    else:
+        _shared_time = 0.0
+        _boards = (Board(puzzle) for puzzle in _misses)
+    for position in _positions:
+        # time the solve of the single puzzle (including the creation of its board)
+        _start = time.perf_counter()
+        _board = next(_boards)
+        if isinstance(_board, str):
+            # the vectorized propagation already solved the board
+            _results[position] = (_board, SOLVED_BY_LOGIC, _shared_time)
+            if _chunk_stats is not None:
+                _chunk_stats.puzzles += 1
+            if _forms[position] is not None:
+                _cache.store(_forms[position], _board, SOLVED_BY_LOGIC, [])
+            continue
+        if _chunk_stats is not None:
+            _board.stats = SolveStats()
+            _board.stats.puzzles = 1
+        _solution, _method = board_solve(_board, options.logic_only)
+        _results[position] = (_solution, _method, _shared_time + time.perf_counter() - _start)
+        if _chunk_stats is not None:
+            _chunk_stats.merge(_board.stats)
+        # a stalled board depends on search being turned off, so it is not stored
+        if _forms[position] is not None and _method != STALLED:
+            _cache.store(_forms[position], _solution, _method, _board.technique_log)
+    if _cache is not None:
+        _cache.flush()
+    return _results, _chunk_stats, _cache_counters
+
+
+# define a function that counts the solutions of every puzzle of a chunk (0, 1, or 2 for 2 or more)
+# (it takes the solve options like chunk_solve, so chunks can be spread across workers the same way)
+def chunk_count(puzzles: List[str], options: SolveOptions = SolveOptions()) -> List[int]:
+    return [solutions_count(Board(puzzle)) for puzzle in puzzles]
+
+
+# define a generator that groups the (puzzle, solution) pairs of a stream into lists of at most chunk size pairs
+def chunk_read(pairs: Iterator[Tuple[str, str]], chunk_size: int) -> Iterator[List[Tuple[str, str]]]:
+    while True:
+        _chunk: List[Tuple[str, str]] = list(islice(pairs, chunk_size))
+        if not _chunk:
+            return
+        yield _chunk
+
+
+# define a generator that solves the chunks and yields (chunk, results) in input order
+# with more than 1 worker, only a bounded number of chunks are in flight at once so memory stays flat
+# any other function that takes the puzzles of a chunk and the options (like chunk_rate) can run in place of chunk_solve
+def chunk_results(chunks: Iterator[List[Tuple[str, str]]], workers: int, options: SolveOptions = SolveOptions(),
+                  chunk_function: Callable = chunk_solve) -> \
+        Iterator[Tuple[List[Tuple[str, str]],
+                       Tuple[List[Tuple[str, str, float]], Optional[SolveStats], Optional[CacheCounters]]]]:
+    # a single worker solves in this process without pickling anything
+    if workers <= 1:
+        for chunk in chunks:
+            yield chunk, chunk_function([puzzle for puzzle, _ in chunk], options)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # create the queue of chunks that have been submitted but not yet written, oldest first
+        _in_flight: Deque[Tuple[List[Tuple[str, str]], Future]] = deque()
+        for chunk in chunks:
+            _in_flight.append((chunk, executor.submit(chunk_function, [puzzle for puzzle, _ in chunk], options)))
+            # keep every worker busy with 1 spare chunk each, then wait for the oldest chunk
+            if len(_in_flight) >= 2 * workers:
+                _oldest_chunk, _oldest_future = _in_flight.popleft()
+                yield _oldest_chunk, _oldest_future.result()
+        # wait for the remaining chunks in order
+        while _in_flight:
+            _oldest_chunk, _oldest_future = _in_flight.popleft()
+            yield _oldest_chunk, _oldest_future.result()
+
+
+class LatencyHistogram:
+    # the number of buckets per factor of 10 in latency (about 2% resolution)
+    BUCKETS_PER_DECADE: int = 100
+    # the shortest latency tracked, in seconds (anything faster lands in the first bucket)
+    MINIMUM_LATENCY: float = 1e-6
+
+    def __init__(self):
+        # create the bucket counts as a dictionary so memory only grows with the spread of latencies, not their number
+        self.buckets: dict = {}
+        # the total number of latencies recorded
+        self.count: int = 0
+
+    # define a function that records a single latency
+    def record(self, latency: float):
+        _bucket: int = int(math.log10(max(latency, self.MINIMUM_LATENCY) / self.MINIMUM_LATENCY)
+                           * self.BUCKETS_PER_DECADE)
+        self.buckets[_bucket] = self.buckets.get(_bucket, 0) + 1
+        self.count += 1
+
+    # define a function that returns the latency at a percentile (0 - 100), in seconds
+    def percentile(self, percent: float) -> float:
+        if self.count == 0:
+            return 0.0
+        # the number of latencies at or below the percentile
+        _target: float = self.count * percent / 100
+        _running_count: int = 0
+        for bucket in sorted(self.buckets):
+            _running_count += self.buckets[bucket]
+            if _running_count >= _target:
+                # return the upper edge of the bucket
+                return self.MINIMUM_LATENCY * 10 ** ((bucket + 1) / self.BUCKETS_PER_DECADE)
+        return 0.0
+
+
+class BatchSummary:
+    def __init__(self):
+        # the number of puzzles solved by logic alone, finished by search, left stalled, without a solution, and
+        # rejected for having more than 1 solution
+        self.solved: int = 0
+        self.searched: int = 0
+        self.stalled: int = 0
+        self.invalid: int = 0
+        self.multiple: int = 0
+        # the number of solved puzzles that did not match the solution column
+        self.mismatched: int = 0
+        # the per puzzle latencies
+        self.latencies: LatencyHistogram = LatencyHistogram()
+        # the total time spent solving across all workers (what a single worker would have needed)
+        self.busy_time: float = 0.0
+        # the number of worker processes used
+        self.workers: int = 1
+        # the per technique statistics of the whole batch, None unless they are collected
+        self.stats: Optional[SolveStats] = None
+        # the counters of the canonical form cache across every worker, None unless the cache is on
+        self.cache: Optional[CacheCounters] = None
+        # the time the batch started
+        self.start_time: float = time.perf_counter()
+
+    # define a function that records the result of a single puzzle
+    def record(self, method: str, matched: bool, latency: float):
+        if method == SOLVED_BY_LOGIC:
+            self.solved += 1
+        elif method == SOLVED_BY_SEARCH:
+            self.searched += 1
+        elif method == STALLED:
+            self.stalled += 1
+        elif method == MULTIPLE_SOLUTIONS:
+            self.multiple += 1
+        else:
+            self.invalid += 1
+        if not matched:
+            self.mismatched += 1
+        self.latencies.record(latency)
+        self.busy_time += latency
+
+    # define a function that returns the summary as a printable string
+    def summary_string(self) -> str:
+        _elapsed: float = time.perf_counter() - self.start_time
+        _total: int = self.solved + self.searched + self.stalled + self.invalid + self.multiple
+        _rate: float = _total / _elapsed if _elapsed > 0 else 0.0
+        # the throughput a single worker would have reached, from the time spent solving
+        _single_worker_rate: float = _total / self.busy_time if self.busy_time > 0 else 0.0
+        _scaling: float = _rate / _single_worker_rate if _single_worker_rate > 0 else 0.0
+        return (f'puzzles: {_total}  solved: {self.solved}  searched: {self.searched}  stalled: {self.stalled}  '
+                f'invalid: {self.invalid}  multiple: {self.multiple}  mismatched: {self.mismatched}\n'
+                f'elapsed: {_elapsed:.3f} s  throughput: {_rate:.1f} puzzles/sec\n'
+                f'workers: {self.workers}  single worker: {_single_worker_rate:.1f} puzzles/sec  '
+                f'scaling: {_scaling:.2f}x\n'
+                f'latency p50: {self.latencies.percentile(50) * 1000:.3f} ms  '
+                f'p99: {self.latencies.percentile(99) * 1000:.3f} ms' +
+                (f'\n{self.cache.summary_string()}' if self.cache is not None else '') +
+                (f'\n{self.stats.table_string()}' if self.stats is not None else ''))
+
+
+# define a function that streams every puzzle of the input through the solver and writes one result line each
+# each result line is the puzzle, the solution string, and the status
+# (solved by logic, searched, stalled, invalid, or mismatch)
+# the puzzles are solved in chunks across the worker processes, and the results are written in input order
+def batch_solve(input_stream: TextIO, output_stream: TextIO, workers: int = 1, chunk_size: int = 64,
+                options: SolveOptions = SolveOptions()) -> BatchSummary:
+    _summary: BatchSummary = BatchSummary()
+    _summary.workers = workers
+    if options.collect_stats:
+        _summary.stats = SolveStats()
+    _chunks: Iterator[List[Tuple[str, str]]] = chunk_read(puzzle_read(input_stream), chunk_size)
+    for chunk, (results, chunk_stats, cache_counters) in chunk_results(_chunks, workers, options):
+        if chunk_stats is not None:
+            _summary.stats.merge(chunk_stats)
+        if cache_counters is not None:
+            if _summary.cache is None:
+                _summary.cache = CacheCounters()
+            _summary.cache.merge(cache_counters)
+        for (puzzle, expected_solution), (_solution, _method, _latency) in zip(chunk, results):
+            # a puzzle only mismatches if it was solved and a different solution was given
+            _solved: bool = _method in (SOLVED_BY_LOGIC, SOLVED_BY_SEARCH)
+            _matched: bool = not (_solved and expected_solution and _solution != expected_solution)
+            _summary.record(_method, _matched, _latency)
+            _status: str = METHOD_STATUSES[_method] if _matched else 'mismatch'
+            output_stream.write(f'{puzzle} {_solution} {_status}\n')
+    return _summary
+
+
+# define a function that counts the solutions of every puzzle of the input and writes one result line each
+# each result line is the puzzle and its count (0, 1, or 2+), written in input order
+def batch_count(input_stream: TextIO, output_stream: TextIO, workers: int = 1, chunk_size: int = 64):
+    _chunks: Iterator[List[Tuple[str, str]]] = chunk_read(puzzle_read(input_stream), chunk_size)
+    for chunk, counts in chunk_results(_chunks, workers, SolveOptions(), chunk_count):
+        for (puzzle, _), count in zip(chunk, counts):
+            output_stream.write(f'{puzzle} {count_string(count)}\n')
+
+
+# define the command line entry point
+def main(argv: Optional[List[str]] = None) -> int:
+    _parser = argparse.ArgumentParser(description='Solve a corpus of sudoku puzzles without a display.')
+    _parser.add_argument('input', nargs='?', default='-',
+                         help="file of puzzles, one 81 character line each ('-' or nothing reads stdin)")
+    _parser.add_argument('-o', '--output', default='-', help="file for the results ('-' or nothing writes stdout)")
+    _parser.add_argument('-w', '--workers', type=int, default=1,
+                         help='number of worker processes (0 uses every core, 1 solves in this process)')
+    _parser.add_argument('-c', '--chunk-size', type=int, default=64,
+                         help='number of puzzles sent to a worker per task')
+    _parser.add_argument('--logic-only', action='store_true',
+                         help='leave puzzles the techniques stall on unsolved instead of finishing them by search')
+    _parser.add_argument('--vectorized', action='store_true',
+                         help='propagate the single candidate techniques on each whole chunk with NumPy first')
+    _parser.add_argument('--stats', action='store_true',
+                         help='collect the calls, time, placements, and eliminations of every technique')
+    _parser.add_argument('--cache-size', type=int, default=0,
+                         help='number of solves the canonical form cache keeps in memory per worker (0 is off)')
+    _parser.add_argument('--cache-file', help='SQLite file that keeps the cached solves across runs '
+                                              '(turns the cache on)')
+    _parser.add_argument('--check-unique', action='store_true',
+                         help='count the solutions of every puzzle first and reject any without exactly 1')
+    _parser.add_argument('--count', action='store_true',
+                         help='only count the solutions of every puzzle, writing 0, 1, or 2+ for each')
+    _arguments = _parser.parse_args(argv)
+    # open the input and output streams
+    _input_stream: TextIO = sys.stdin if _arguments.input == '-' else open(_arguments.input, 'r')
+    _output_stream: TextIO = sys.stdout if _arguments.output == '-' else open(_arguments.output, 'w')
+    try:
+        if _arguments.count:
+            batch_count(_input_stream, _output_stream, _arguments.workers or os.cpu_count() or 1,
+                        max(1, _arguments.chunk_size))
+            return 0
+        _summary: BatchSummary = batch_solve(_input_stream, _output_stream,
+                                             _arguments.workers or os.cpu_count() or 1, max(1, _arguments.chunk_size),
+                                             SolveOptions(_arguments.logic_only, _arguments.vectorized,
+                                                          _arguments.stats, max(0, _arguments.cache_size),
+                                                          _arguments.cache_file, _arguments.check_unique))
+    finally:
+        # close only the streams that were opened here
+        if _input_stream is not sys.stdin:
+            _input_stream.close()
+        if _output_stream is not sys.stdout:
+            _output_stream.close()
+    # the summary goes to stderr so it never mixes with the results
+    print(_summary.summary_string(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
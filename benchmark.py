@@ -0,0 +1,192 @@
+# This file contains the headless benchmark suite for the board, its techniques, and full solves
+import argparse
+import copy
+import gc
+import json
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from board import Board, BoardSnapshot
+from search import complete_solve
+
+# the file holding the graded games
+GAMES_FILE: str = 'sudoku_game.txt'
+
+
+# define a function that reads the graded games (every puzzle line that follows a 'game' title line)
+def graded_games_read(path: str = GAMES_FILE) -> List[Tuple[str, str]]:
+    with open(path, 'r') as games_file:
+        _lines: List[str] = list(map(str.strip, games_file.readlines()))
+    return [(_lines[index], _lines[index + 1]) for index in range(len(_lines) - 1)
+            if _lines[index].startswith('game') and len(_lines[index + 1]) == 81]
+
+
+# define a function that creates an equivalent puzzle by relabeling the digits and shuffling rows, columns, bands,
+# and stacks, and maybe transposing (every one of these keeps a valid puzzle valid and just as hard)
+def puzzle_shuffle(puzzle: str, generator: random.Random) -> str:
+    _digits: List[str] = list('123456789')
+    generator.shuffle(_digits)
+    _relabel: Dict[str, str] = dict(zip('123456789', _digits))
+    # create a random order of the rows: shuffle the bands, then the rows inside each band (same for the columns)
+    _orders: List[List[int]] = []
+    for _ in range(2):
+        _bands: List[int] = [0, 1, 2]
+        generator.shuffle(_bands)
+        _order: List[int] = []
+        for band in _bands:
+            _lines: List[int] = [3 * band, 3 * band + 1, 3 * band + 2]
+            generator.shuffle(_lines)
+            _order.extend(_lines)
+        _orders.append(_order)
+    _rows, _cols = _orders
+    _transpose: bool = generator.random() < 0.5
+    _cells: List[str] = []
+    for row in range(9):
+        for col in range(9):
+            _row, _col = (_rows[col], _cols[row]) if _transpose else (_rows[row], _cols[col])
+            _character: str = puzzle[9 * _row + _col]
+            _cells.append(_relabel.get(_character, '0'))
+    return ''.join(_cells)
+
+
+# define a function that creates a seeded corpus of puzzles equivalent to the graded games
+def corpus_generate(games: List[str], size: int, seed: int) -> List[str]:
+    _generator: random.Random = random.Random(seed)
+    return [puzzle_shuffle(games[index % len(games)], _generator) for index in range(size)]
+
+
+# define a function that times a function, returning the best time per call (in seconds) of several repeats
+def best_time(function: Callable, number: int, repeat: int) -> float:
+    _best: float = float('inf')
+    for _ in range(repeat):
+        _start: float = time.perf_counter()
+        for _ in range(number):
+            function()
+        _best = min(_best, (time.perf_counter() - _start) / number)
+    return _best
+
+
+# define a function that times a technique on a board state, returning the best time of a single call (in seconds)
+# the board is put back to the state from a snapshot before every call, outside of the timed region
+# (the garbage collector is turned off while timing, like timeit does, so a collection can't land in a call)
+def technique_time(state: Board, name: str, repeat: int) -> float:
+    _snapshot: BoardSnapshot = state.snapshot()
+    _technique: Callable = getattr(state, name)
+    _best: float = float('inf')
+    _gc_enabled: bool = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            state.restore(_snapshot)
+            _start: float = time.perf_counter()
+            _technique()
+            _best = min(_best, time.perf_counter() - _start)
+    finally:
+        if _gc_enabled:
+            gc.enable()
+    state.restore(_snapshot)
+    return _best
+
+
+# define a function that finds the board states where each technique actually makes a change
+# returns a dictionary from the technique name to the list of boards just before the technique fired
+def technique_states_find(puzzles: List[str]) -> Dict[str, List[Board]]:
+    _states: Dict[str, List[Board]] = {}
+    for puzzle in puzzles:
+        _board: Board = Board(puzzle)
+        # wrap every technique to keep a copy of the board whenever the technique changes it
+        _wrapped: List[Callable] = []
+        for technique in _board.solve_techniques:
+            def _wrapper(technique=technique):
+                _before: Board = copy.deepcopy(_board)
+                _changes: Tuple[int, int] = (_board.placements, _board.eliminations)
+                technique()
+                if (_board.placements, _board.eliminations) != _changes:
+                    _states.setdefault(technique.__name__, []).append(_before)
+            _wrapper.__name__ = technique.__name__
+            _wrapped.append(_wrapper)
+        _board.general_solver(_wrapped)
+    return _states
+
+
+# define a function that runs every benchmark and returns the results as a dictionary
+# every result is the best time per operation in seconds
+def benchmark_run(corpus_size: int, seed: int, repeat: int) -> Dict[str, float]:
+    _games: List[Tuple[str, str]] = graded_games_read()
+    _puzzles: List[str] = [puzzle for _, puzzle in _games]
+    _results: Dict[str, float] = {}
+    # time the construction of a board from every graded game
+    _results['construction/board'] = best_time(lambda: [Board(puzzle) for puzzle in _puzzles], 20, repeat) / \
+        len(_puzzles)
+    # time each technique on the boards where it fires
+    for name, states in sorted(technique_states_find(_puzzles).items()):
+        _results[f'technique/{name}'] = sum(technique_time(state, name, 5 * repeat) for state in states) / len(states)
+    # time the full solve (techniques and search) of every graded game
+    for title, puzzle in _games:
+        _results[f'solve/{title.split(",")[0]}'] = best_time(lambda: complete_solve(Board(puzzle)), 5, repeat)
+    # time the full solve of the generated corpus, per puzzle
+    _corpus: List[str] = corpus_generate(_puzzles, corpus_size, seed)
+    _results['solve/corpus'] = best_time(lambda: [complete_solve(Board(puzzle)) for puzzle in _corpus], 1, repeat) / \
+        len(_corpus)
+    return _results
+
+
+# define a function that compares results against a baseline, returns the list of regressions as printable lines
+# a regression is any benchmark that got slower by more than the threshold (0.1 is 10% slower)
+def benchmark_compare(baseline: Dict[str, float], current: Dict[str, float], threshold: float) -> List[str]:
+    _regressions: List[str] = []
+    for name in sorted(current):
+        if name not in baseline or baseline[name] <= 0:
+            continue
+        _ratio: float = current[name] / baseline[name]
+        _line: str = f'{name}: {baseline[name] * 1e6:.1f} us -> {current[name] * 1e6:.1f} us ({_ratio:.2f}x)'
+        if _ratio > 1 + threshold:
+            _regressions.append(_line)
+        print(('REGRESSION ' if _ratio > 1 + threshold else '') + _line)
+    return _regressions
+
+
+# define a function that reads the results of a saved benchmark file
+def results_read(path: str) -> Dict[str, float]:
+    with open(path, 'r') as results_file:
+        return json.load(results_file)['results']
+
+
+# define the command line entry point
+def main(argv: Optional[List[str]] = None) -> int:
+    _parser = argparse.ArgumentParser(description='Benchmark the headless sudoku solver.')
+    _subparsers = _parser.add_subparsers(dest='command', required=True)
+    _run_parser = _subparsers.add_parser('run', help='run the benchmarks and save the results as JSON')
+    _run_parser.add_argument('-o', '--output', default='benchmark.json', help='file for the JSON results')
+    _run_parser.add_argument('--corpus-size', type=int, default=2000, help='number of generated puzzles to solve')
+    _run_parser.add_argument('--seed', type=int, default=1, help='seed of the generated corpus')
+    _run_parser.add_argument('--repeat', type=int, default=3, help='number of repeats (the best one is kept)')
+    _run_parser.add_argument('--baseline', help='saved results to compare the new results against')
+    _run_parser.add_argument('--threshold', type=float, default=0.1, help='slowdown counted as a regression')
+    _compare_parser = _subparsers.add_parser('compare', help='compare two saved results files')
+    _compare_parser.add_argument('baseline', help='the saved baseline results')
+    _compare_parser.add_argument('current', help='the saved results to check')
+    _compare_parser.add_argument('--threshold', type=float, default=0.1, help='slowdown counted as a regression')
+    _arguments = _parser.parse_args(argv)
+    if _arguments.command == 'run':
+        _results: Dict[str, float] = benchmark_run(_arguments.corpus_size, _arguments.seed, _arguments.repeat)
+        with open(_arguments.output, 'w') as output_file:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'corpus_size': _arguments.corpus_size, 'seed': _arguments.seed,
+                       'results': _results}, output_file, indent=2, sort_keys=True)
+        for name, seconds in sorted(_results.items()):
+            print(f'{name}: {seconds * 1e6:.1f} us')
+        if not _arguments.baseline:
+            return 0
+        _baseline: Dict[str, float] = results_read(_arguments.baseline)
+    else:
+        _baseline = results_read(_arguments.baseline)
+        _results = results_read(_arguments.current)
+    # any regression fails the run
+    return 1 if benchmark_compare(_baseline, _results, _arguments.threshold) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
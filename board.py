@@ -0,0 +1,730 @@
+# This file contains the entire Board class, the headless solving core that the Grid mirrors
+import time
+from itertools import combinations
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+from houses import CELL_HOUSE_BITS, CELL_HOUSES, CELL_ROW, COL_BLOCK_INTERSECTIONS, HOUSES, PEER_SETS, PEERS, \
+    ROW_BLOCK_INTERSECTIONS
+from solve_trace import SolveTrace
+
+# create a list of the single bit mask for each digit (index 0 is unused so a digit can index the list directly)
+DIGIT_MASKS: List[int] = [0] + [1 << (digit - 1) for digit in range(1, 10)]
+# the mask of a cell that still has all 9 candidates
+ALL_CANDIDATES: int = 0b111111111
+# create a table of the candidates (as a tuple of digits) for every one of the 512 possible masks
+MASK_CANDIDATES: List[tuple] = [tuple(digit for digit in range(1, 10) if mask & DIGIT_MASKS[digit])
+                                for mask in range(ALL_CANDIDATES + 1)]
+# create a table of the number of candidates for every one of the 512 possible masks
+MASK_SIZES: List[int] = [len(candidates) for candidates in MASK_CANDIDATES]
+# the most links the chain techniques follow from the start of a chain
+MAX_CHAIN_LENGTH: int = 16
+# the most cells (and candidates) a wing has, the cells with up to this many candidates are kept in an index
+MAX_WING_SIZE: int = 4
+
+
+class BoardSnapshot(NamedTuple):
+    # the candidates, solutions, house positions, and index of small cells of the board when the snapshot was taken
+    masks: List[int]
+    solution: List[int]
+    house_positions: List[List[int]]
+    small_cells: List[Set[int]]
+    # the propagation queue and the running counts of the board
+    single_queue: List[int]
+    placements: int
+    eliminations: int
+
+
+class Board:
+    def __init__(self, game: str, record_trace: bool = False):
+        # the candidates of all 81 cells, stored as 9 bit masks (bit 0 is the candidate 1)
+        self.masks: List[int] = [ALL_CANDIDATES] * 81
+        # the positions of every candidate in every one of the 27 houses, stored as 9 bit masks and kept up to date
+        # as candidates are removed (the strong links of the chain techniques are the houses with 2 positions)
+        self.house_positions: List[List[int]] = [[ALL_CANDIDATES] * 27 for _ in range(10)]
+        # the index of the unsolved cells with 2 to 4 candidates by their number of candidates (the cells the wing
+        # techniques are made of), kept up to date as candidates are removed (the sets for 0 and 1 are unused)
+        self.small_cells: List[Set[int]] = [set() for _ in range(MAX_WING_SIZE + 1)]
+        # whether the candidates, solutions, and house positions are shared with a fork of the board, in which case
+        # they are copied before the first change (copy on write)
+        self.state_shared: bool = False
+        # any given number of the puzzle for every cell, otherwise, defaults to 0
+        self.given: List[int] = [0] * 81
+        # the solution to every cell, otherwise, defaults to 0
+        self.solution: List[int] = [0] * 81
+        # create the propagation queue of cells that have dropped to a single candidate
+        self.single_queue: List[int] = []
+        # create the running counts of the digits placed and the candidates eliminated on the board
+        self.placements: int = 0
+        self.eliminations: int = 0
+        # the trace of every change made by each technique step, None unless it is recorded
+        self.trace: Optional[SolveTrace] = SolveTrace() if record_trace else None
+        # set the givens of the puzzle
+        self.given_generate(game)
+        # the givens are not counted as changes made by solving
+        self.placements = self.eliminations = 0
+        # the first step of the trace is the eliminations made by the givens (the givens are already displayed)
+        if self.trace is not None:
+            self.trace.placements.clear()
+            self.trace.eliminations[:] = [(index, mask) for index, mask in self.trace.eliminations
+                                          if not self.given[index]]
+            self.trace.step_end('givens')
+        # create a list of the solving techniques the board has, in order of increasing complexity
+        self.solve_techniques: List[Callable] = [
+            self.single_cand_solve,
+            self.full_grid_lone_candidates,
+            self.subset_pairs_full_grid,
+            self.pointing_pairs_full_grid,
+            self.subset_triples_quads_full_grid,
+            self.bi_value_graveyard,
+            self.x_wing,
+            self.y_wing,
+            self.xyz_wing,
+            self.simple_coloring,
+            self.swordfish,
+            self.jellyfish,
+            self.wxyz_wing,
+            self.x_cycles,
+            self.xy_chains,
+            self.forcing_chains
+        ]
+        # create a variable to track the number of times a solving technique was used
+        self.num_iterations: int = 0
+        # create the log of every technique step that changed the board, as (technique name, placements, eliminations)
+        self.technique_log: List[Tuple[str, int, int]] = []
+        # the statistics hook (such as a SolveStats) that is told about every technique call, None turns it off
+        self.stats = None
+        # the function called before every technique call, the scheduler stops early when it returns True
+        # (used to cancel or time out a solve running in the background), None turns it off
+        self.stop_check: Optional[Callable[[], bool]] = None
+
+    # add the string method to print the board as a single string of solutions
+    def __str__(self):
+        return self.solution_string()
+
+    # define a function that sets the givens from a game string ('0' or '.' are blank cells)
+    def given_generate(self, game: str):
+        # iterate for all 81 characters in the game
+        for index in range(81):
+            # blank cells are skipped
+            if game[index] not in '0.':
+                self.set_given(index, int(game[index]))
+
+    # define a function that sets a given, clears the candidates, and removes the given from the cell's peers
+    def set_given(self, index: int, given: int):
+        self.given[index] = given
+        self.set_solution(index, given)
+
+    # define a function to set a solution, clear the candidates, and remove the solution from the cell's peers
+    def set_solution(self, index: int, solution: int):
+        if self.state_shared:
+            self.state_unshare()
+        if self.trace is not None:
+            self.trace.placement(index, solution, self.masks[index])
+        self.solution[index] = solution
+        self.house_positions_remove(index, self.masks[index])
+        if MASK_SIZES[self.masks[index]] <= MAX_WING_SIZE:
+            self.small_cells[MASK_SIZES[self.masks[index]]].discard(index)
+        self.masks[index] = 0
+        self.placements += 1
+        self.peer_candidates_remove(index)
+
+    # define a function that removes a mask of candidates from a cell, queueing the cell if one candidate is left
+    def candidates_remove(self, index: int, mask: int):
+        # only cells that have any of the candidates are changed
+        if self.masks[index] & mask:
+            if self.state_shared:
+                self.state_unshare()
+            self.eliminations += MASK_SIZES[self.masks[index] & mask]
+            if self.trace is not None:
+                self.trace.elimination(index, self.masks[index] & mask)
+            self.house_positions_remove(index, self.masks[index] & mask)
+            _old_size: int = MASK_SIZES[self.masks[index]]
+            self.masks[index] &= ~mask
+            _size: int = MASK_SIZES[self.masks[index]]
+            # move the cell in the index of small cells
+            if _old_size <= MAX_WING_SIZE:
+                self.small_cells[_old_size].discard(index)
+            if 2 <= _size <= MAX_WING_SIZE:
+                self.small_cells[_size].add(index)
+            # queue the cell to be promoted by the single candidate technique
+            elif _size == 1:
+                self.single_queue.append(index)
+
+    # define a function that removes a cell from the house positions of candidates it no longer has
+    # (it runs for every elimination, so the 3 houses are unpacked instead of looped over)
+    def house_positions_remove(self, index: int, mask: int):
+        _row, _row_bit, _col, _col_bit, _block, _block_bit = CELL_HOUSE_BITS[index]
+        for candidate in MASK_CANDIDATES[mask]:
+            _positions: List[int] = self.house_positions[candidate]
+            _positions[_row] ^= _row_bit
+            _positions[_col] ^= _col_bit
+            _positions[_block] ^= _block_bit
+
+    # define a function that recreates the house positions from the candidates of every cell
+    def house_positions_generate(self):
+        self.house_positions = [[0] * 27 for _ in range(10)]
+        for index in range(81):
+            _row, _row_bit, _col, _col_bit, _block, _block_bit = CELL_HOUSE_BITS[index]
+            for candidate in MASK_CANDIDATES[self.masks[index]]:
+                _positions: List[int] = self.house_positions[candidate]
+                _positions[_row] |= _row_bit
+                _positions[_col] |= _col_bit
+                _positions[_block] |= _block_bit
+
+    # define a function that replaces the state of the board with the candidates, solutions, and givens of every cell
+    # (the lists are copied, and the cells left with a single candidate are queued for the single candidate technique)
+    def state_load(self, masks: List[int], solution: List[int], given: List[int]):
+        self.masks = list(masks)
+        self.solution = list(solution)
+        self.given = list(given)
+        self.house_positions_generate()
+        self.small_cells = [set() for _ in range(MAX_WING_SIZE + 1)]
+        for index in range(81):
+            if 2 <= MASK_SIZES[self.masks[index]] <= MAX_WING_SIZE:
+                self.small_cells[MASK_SIZES[self.masks[index]]].add(index)
+        self.single_queue = [index for index in range(81) if MASK_SIZES[self.masks[index]] == 1]
+        self.state_shared = False
+
+    # define a function that copies the state shared with a fork, so the board can change it on its own
+    def state_unshare(self):
+        self.masks = self.masks[:]
+        self.solution = self.solution[:]
+        self.house_positions = [positions[:] for positions in self.house_positions]
+        self.small_cells = [set(cells) for cells in self.small_cells]
+        self.state_shared = False
+
+    # define a function that takes a snapshot of the state of the board (a copy of a few small lists and sets)
+    def snapshot(self) -> BoardSnapshot:
+        return BoardSnapshot(self.masks[:], self.solution[:], [positions[:] for positions in self.house_positions],
+                             [set(cells) for cells in self.small_cells], self.single_queue[:], self.placements,
+                             self.eliminations)
+
+    # define a function that puts the board back to the state of a snapshot (the snapshot can be restored again)
+    # the trace and the technique log are not rolled back
+    def restore(self, snapshot: BoardSnapshot):
+        self.masks = snapshot.masks[:]
+        self.solution = snapshot.solution[:]
+        self.house_positions = [positions[:] for positions in snapshot.house_positions]
+        self.small_cells = [set(cells) for cells in snapshot.small_cells]
+        self.single_queue = snapshot.single_queue[:]
+        self.placements, self.eliminations = snapshot.placements, snapshot.eliminations
+        self.state_shared = False
+
+    # define a function that creates a fork of the board for a speculative branch, without a trace or hooks
+    # the fork shares the state of the board until either of them changes it, which then copies it first
+    def fork(self) -> 'Board':
+        _fork: Board = Board.__new__(Board)
+        _fork.__dict__.update(self.__dict__)
+        _fork.single_queue = self.single_queue[:]
+        _fork.trace = _fork.stats = _fork.stop_check = None
+        _fork.technique_log = []
+        _fork.num_iterations = 0
+        # the techniques of the fork must run on the fork
+        _fork.solve_techniques = [getattr(_fork, technique.__name__) for technique in self.solve_techniques]
+        self.state_shared = _fork.state_shared = True
+        return _fork
+
+    # define a function that removes a single candidate from a cell
+    def candidate_remove(self, index: int, candidate: int):
+        self.candidates_remove(index, DIGIT_MASKS[candidate])
+
+    # define a function that returns the list of candidates a cell has
+    def candidates(self, index: int) -> tuple:
+        return MASK_CANDIDATES[self.masks[index]]
+
+    # define a function that finds the total number of candidates in the grid
+    def candidates_in_grid(self) -> int:
+        # add the number of candidates of every cell
+        return sum(MASK_SIZES[mask] for mask in self.masks)
+
+    # define a function that finds the number of unsolved cells in the grid
+    def unsolved_in_grid(self) -> int:
+        # count every cell that still has candidates
+        return sum(1 for mask in self.masks if mask)
+
+    # define a function that checks whether every cell has a solution
+    # (an unsolved cell can also run out of candidates if the puzzle has no solution)
+    def is_solved(self) -> bool:
+        return 0 not in self.solution
+
+    # define a function that returns the solved sudoku as a single string
+    def solution_string(self) -> str:
+        return ''.join(map(str, self.solution))
+
+    # define a function that checks whether the solved solution is the same as the given solution
+    # without the full solution, checks that every cell is solved and every house holds every digit
+    def solve_check(self, full_solution: Optional[str] = None) -> bool:
+        if full_solution:
+            return self.solution_string() == full_solution
+        return self.is_solved() and all(len({self.solution[index] for index in house}) == 9 for house in HOUSES)
+
+    # define a function that removes a new solution from the candidates of the cell's 20 peers
+    def peer_candidates_remove(self, index: int):
+        # create a variable for the mask of the solution
+        _bit: int = DIGIT_MASKS[self.solution[index]]
+        for peer in PEERS[index]:
+            self.candidates_remove(peer, _bit)
+
+    # define a function that promotes every queued single candidate to a solution
+    # each promotion removes the solution from the cell's peers, which can queue more single candidates
+    def single_cand_solve(self):
+        # iterate until the propagation queue is empty
+        while self.single_queue:
+            index: int = self.single_queue.pop()
+            # check the cell still has only one candidate (it may have been solved since it was queued)
+            if MASK_SIZES[self.masks[index]] == 1:
+                # promote the single candidate to a solution
+                self.set_solution(index, MASK_CANDIDATES[self.masks[index]][0])
+
+    # define a function that finds the lone candidate of a cell in one of its houses, if it has one
+    def lone_candidate_search(self, index: int, house: int) -> int:
+        # create a mask of all the candidates in the house (without the candidates of the cell of interest)
+        _house_mask: int = 0
+        for test_index in HOUSES[house]:
+            if test_index != index:
+                _house_mask |= self.masks[test_index]
+        # the candidates of the cell that are not found elsewhere in the house
+        _lone_mask: int = self.masks[index] & ~_house_mask
+        # return the lowest lone candidate, or 0 if there isn't one
+        return MASK_CANDIDATES[_lone_mask][0] if _lone_mask else 0
+
+    # define a function that finds the lone candidates of every cell
+    def full_grid_lone_candidates(self):
+        # iterate for all cells in the grid
+        for index in range(81):
+            # iterate over every house of the cell
+            for house in CELL_HOUSES[index]:
+                # skip the cell once it has been solved
+                if not self.masks[index]:
+                    break
+                _lone_candidate: int = self.lone_candidate_search(index, house)
+                if _lone_candidate:
+                    # if the candidate is not found elsewhere in the house, the candidate is the solution
+                    self.set_solution(index, _lone_candidate)
+
+    # define a function that finds the naked and hidden subsets of a range of sizes in a house
+    # a naked subset is size cells with only size candidates between them, which are removed from the rest of the house
+    # a hidden subset is size candidates found in only size cells, which lose every other candidate
+    def subsets_in_house(self, house: int, min_size: int, max_size: int):
+        _cells: List[int] = [index for index in HOUSES[house] if self.masks[index]]
+        for size in range(min_size, min(max_size, len(_cells) - 1) + 1):
+            # only a cell with 2 to size candidates can be part of a naked subset
+            _subset_cells: List[int] = [index for index in _cells if 2 <= MASK_SIZES[self.masks[index]] <= size]
+            for subset in combinations(_subset_cells, size):
+                _union_mask: int = 0
+                for index in subset:
+                    _union_mask |= self.masks[index]
+                if MASK_SIZES[_union_mask] == size:
+                    for index in _cells:
+                        if index not in subset:
+                            self.candidates_remove(index, _union_mask)
+        # create the positions of every candidate among the unsolved cells of the house, as bit masks
+        _positions: List[int] = [0] * 10
+        for position, index in enumerate(_cells):
+            for candidate in MASK_CANDIDATES[self.masks[index]]:
+                _positions[candidate] |= 1 << position
+        _candidates: List[int] = [candidate for candidate in range(1, 10) if _positions[candidate]]
+        for size in range(min_size, min(max_size, len(_candidates) - 1) + 1):
+            # only a candidate in 2 to size cells can be part of a hidden subset
+            _subset_candidates: List[int] = [candidate for candidate in _candidates
+                                             if 2 <= MASK_SIZES[_positions[candidate]] <= size]
+            for subset in combinations(_subset_candidates, size):
+                _union_positions: int = 0
+                _subset_mask: int = 0
+                for candidate in subset:
+                    _union_positions |= _positions[candidate]
+                    _subset_mask |= DIGIT_MASKS[candidate]
+                if MASK_SIZES[_union_positions] == size:
+                    for position, index in enumerate(_cells):
+                        if _union_positions >> position & 1:
+                            self.candidates_remove(index, ALL_CANDIDATES & ~_subset_mask)
+
+    # define the naked and hidden pair technique for all 27 houses
+    def subset_pairs_full_grid(self):
+        for house in range(27):
+            self.subsets_in_house(house, 2, 2)
+
+    # define the naked and hidden triple and quad technique for all 27 houses
+    def subset_triples_quads_full_grid(self):
+        for house in range(27):
+            self.subsets_in_house(house, 3, 4)
+
+    # define the pointing pairs technique for one intersection of a row or column with a block
+    def pointing_pairs_base(self, shared: tuple, line_only: tuple, block_only: tuple):
+        # create the masks of the candidates in the intersection, in the rest of the line, and in the rest of the block
+        _first, _second, _third = (self.masks[index] for index in shared)
+        _shared_mask: int = _first | _second | _third
+        _line_mask: int = 0
+        for index in line_only:
+            _line_mask |= self.masks[index]
+        _block_mask: int = 0
+        for index in block_only:
+            _block_mask |= self.masks[index]
+        # a pointing pair needs the candidate in at least 2 cells of the intersection
+        _pair_mask: int = (_first & _second) | (_first & _third) | (_second & _third)
+        # candidates locked in the intersection by the block are removed from the rest of the line (pointing pairs)
+        _pointing_mask: int = _pair_mask & ~_block_mask & _line_mask
+        if _pointing_mask:
+            for index in line_only:
+                self.candidates_remove(index, _pointing_mask)
+        # candidates locked in the intersection by the line are removed from the rest of the block (box/line reduction)
+        _claiming_mask: int = _pair_mask & ~_line_mask & _block_mask
+        if _claiming_mask:
+            for index in block_only:
+                self.candidates_remove(index, _claiming_mask)
+
+    # define a function that iterates all versions of the pointing pairs technique for the whole grid
+    def pointing_pairs_full_grid(self):
+        # iterate for all 54 row-block and column-block intersections
+        for intersections in (ROW_BLOCK_INTERSECTIONS, COL_BLOCK_INTERSECTIONS):
+            for _line, _block, shared, line_only, block_only in intersections:
+                self.pointing_pairs_base(shared, line_only, block_only)
+
+    # define the bi value graveyard (BUG + 1) technique
+    def bi_value_graveyard(self):
+        # get the total grid candidates and total unsolved cells
+        _grid_candidates: int = self.candidates_in_grid()
+        _grid_unsolved: int = self.unsolved_in_grid()
+        # every unsolved cell has 2 candidates except a single cell with 3
+        if _grid_candidates % 2 == 1 and _grid_candidates // 2 == _grid_unsolved:
+            # iterate for all cells
+            for index in range(81):
+                # only check the cell that has 3 candidates
+                if MASK_SIZES[self.masks[index]] == 3:
+                    # the solution is the candidate that appears 3 times in the cell's row
+                    for candidate in MASK_CANDIDATES[self.masks[index]]:
+                        if sum(1 for test_index in HOUSES[CELL_ROW[index]]
+                               if self.masks[test_index] & DIGIT_MASKS[candidate]) == 3:
+                            self.set_solution(index, candidate)
+                            break
+                    # end the loop after the bug cell has been found
+                    break
+
+    # define the basic fish technique of a size (2 is the x wing, 3 the swordfish, 4 the jellyfish)
+    # when a candidate's positions in size base lines all fall in size cover lines, the candidate is removed from the
+    # rest of the cover lines
+    # (the positions of a candidate in a row are its columns, and the positions in a column are its rows)
+    def fish(self, size: int):
+        for candidate in range(1, 10):
+            _positions: List[int] = self.house_positions[candidate]
+            # rows as the base lines (columns as the cover lines), then columns as the base lines
+            for base_positions, cover_house in ((_positions[0:9], 9), (_positions[9:18], 0)):
+                # only a line with 2 to size positions can be a base line
+                _lines: List[int] = [line for line in range(9) if 2 <= MASK_SIZES[base_positions[line]] <= size]
+                for base_lines in combinations(_lines, size):
+                    _cover_mask: int = 0
+                    for line in base_lines:
+                        _cover_mask |= base_positions[line]
+                    if MASK_SIZES[_cover_mask] != size:
+                        continue
+                    # the position of a cell in a cover line is the number of its base line
+                    for position in MASK_CANDIDATES[_cover_mask]:
+                        for line, test_index in enumerate(HOUSES[cover_house + position - 1]):
+                            if line not in base_lines:
+                                self.candidate_remove(test_index, candidate)
+
+    # define the full x wing technique
+    def x_wing(self):
+        self.fish(2)
+
+    # define the full swordfish technique
+    def swordfish(self):
+        self.fish(3)
+
+    # define the full jellyfish technique
+    def jellyfish(self):
+        self.fish(4)
+
+    # define the wing technique: a pivot cell and size - 1 of its peers with size candidates between them, where every
+    # candidate but one is restricted (all the cells with it see each other)
+    # the cells can't all be filled without the unrestricted candidate, so it is removed from every cell that sees all
+    # the cells with it (the xyz wing has size 3 and bi value wings, the wxyz wing has size 4, and the xy wing has its
+    # own bi value fast path)
+    def wing(self, size: int, pivot_sizes: range, wing_sizes: range):
+        # the cells that can be wings, read from the index (copied, since the pass changes the index)
+        _indexed: Set[int] = set().union(*(self.small_cells[wing_size] for wing_size in wing_sizes))
+        for pivot in [cell for pivot_size in pivot_sizes for cell in self.small_cells[pivot_size]]:
+            # the pivot may have lost candidates to an earlier wing of the pass
+            if MASK_SIZES[self.masks[pivot]] not in pivot_sizes:
+                continue
+            # the wings are the indexed peers sharing a candidate with the pivot
+            _wings: List[int] = [peer for peer in PEER_SETS[pivot] & _indexed if self.masks[peer] & self.masks[pivot]]
+            self.wing_extend(size, [pivot], self.masks[pivot], 0, _wings, 0)
+
+    # define a function that adds wings to a partial wing, as long as the cells have no more than size candidates and
+    # no more than one unrestricted candidate (a candidate 2 cells that don't see each other both have, adding cells
+    # never makes it restricted again)
+    # a partial wing of size - 1 cells (at least 3) with size - 1 candidates is skipped, the smaller wing pass has
+    # already used it
+    def wing_extend(self, size: int, cells: List[int], union_mask: int, unrestricted_mask: int, wings: List[int],
+                    first: int):
+        # the number of cells once a wing is added, and the union size that makes them a smaller wing (0 for none)
+        _count: int = len(cells) + 1
+        _smaller_size: int = _count if 3 <= _count == size - 1 else 0
+        # a full wing must have exactly size candidates, a partial one no more
+        _full: bool = _count == size
+        for position in range(first, len(wings)):
+            _wing: int = wings[position]
+            _union_mask: int = union_mask | self.masks[_wing]
+            _union_size: int = MASK_SIZES[_union_mask]
+            if _union_size > size or _union_size == _smaller_size or (_full and _union_size != size):
+                continue
+            _unrestricted_mask: int = unrestricted_mask
+            for cell in cells:
+                if cell not in PEER_SETS[_wing]:
+                    _unrestricted_mask |= self.masks[cell] & self.masks[_wing]
+            if MASK_SIZES[_unrestricted_mask] > 1:
+                continue
+            # a full wing is used straight away, without another call
+            if not _full:
+                self.wing_extend(size, cells + [_wing], _union_mask, _unrestricted_mask, wings, position + 1)
+            elif _unrestricted_mask:
+                self.wing_eliminate(cells + [_wing], _unrestricted_mask)
+
+    # define a function that removes the unrestricted candidate of a wing from every cell that sees all its holders
+    # (with every candidate restricted the cells are a naked subset, which the subset technique handles)
+    def wing_eliminate(self, cells: List[int], unrestricted_mask: int):
+        _holders: List[int] = [cell for cell in cells if self.masks[cell] & unrestricted_mask]
+        # (the other cells of the wing don't have the candidate, and a holder is not its own peer)
+        for test_index in frozenset.intersection(*(PEER_SETS[holder] for holder in _holders)):
+            if self.masks[test_index] & unrestricted_mask:
+                self.candidates_remove(test_index, unrestricted_mask)
+
+    # define the y-wing technique for a bi value pivot: 2 bi value peers each with one of the pivot's candidates and
+    # the same 3rd candidate (the y wing candidate), which is removed from every cell seeing both wings
+    # (the bi value fast path of the wing engine, read from the index of bi value cells)
+    def y_wing_single_cell(self, index: int):
+        _pivot_mask: int = self.masks[index]
+        _first_bit, _second_bit = (DIGIT_MASKS[candidate] for candidate in MASK_CANDIDATES[_pivot_mask])
+        # create the lists of bi value peers containing exactly one of the pivot's candidates
+        _first_wings: List[int] = []
+        _second_wings: List[int] = []
+        for peer in PEER_SETS[index] & self.small_cells[2]:
+            if self.masks[peer] != _pivot_mask:
+                if self.masks[peer] & _first_bit:
+                    _first_wings.append(peer)
+                elif self.masks[peer] & _second_bit:
+                    _second_wings.append(peer)
+        # iterate through every pair of wings
+        for first_wing in _first_wings:
+            for second_wing in _second_wings:
+                # the wings must share the same 3rd candidate (the y wing candidate)
+                _wing_mask: int = self.masks[first_wing] & ~_first_bit
+                if _wing_mask and _wing_mask == self.masks[second_wing] & ~_second_bit:
+                    # remove the y wing candidate from all the cells visible to both wings
+                    for test_index in PEER_SETS[first_wing] & PEER_SETS[second_wing]:
+                        if self.masks[test_index] & _wing_mask:
+                            self.candidates_remove(test_index, _wing_mask)
+
+    # define the full y-wing technique
+    def y_wing(self):
+        # only bi value cells can be the hinge of a y-wing (the cells are taken in order and looked up in the index
+        # as the pass reaches them, since an earlier y-wing of the pass can make or unmake a bi value cell)
+        for index in range(81):
+            if index in self.small_cells[2]:
+                self.y_wing_single_cell(index)
+
+    # define the full xyz-wing technique (a pivot with 3 candidates)
+    def xyz_wing(self):
+        self.wing(3, range(3, 4), range(2, 3))
+
+    # define the full wxyz-wing technique (any pivot)
+    def wxyz_wing(self):
+        self.wing(4, range(2, 5), range(2, 5))
+
+    # define a function that returns the strong links of a candidate, read from the house positions
+    # (2 cells are strongly linked when they are the only 2 cells of a house with the candidate, so one must hold it)
+    def strong_links(self, candidate: int) -> Dict[int, Set[int]]:
+        _links: Dict[int, Set[int]] = {}
+        for house, positions in enumerate(self.house_positions[candidate]):
+            if MASK_SIZES[positions] == 2:
+                _first, _second = (HOUSES[house][position - 1] for position in MASK_CANDIDATES[positions])
+                _links.setdefault(_first, set()).add(_second)
+                _links.setdefault(_second, set()).add(_first)
+        return _links
+
+    # define the simple coloring technique
+    # the cells joined by strong links of a candidate are colored in 2 alternating colors, one of which holds the
+    # candidate: a color seen twice in a house is false (color wrap), and a cell seeing both colors is false (color trap)
+    def simple_coloring(self):
+        for candidate in range(1, 10):
+            _bit: int = DIGIT_MASKS[candidate]
+            _links: Dict[int, Set[int]] = self.strong_links(candidate)
+            _colored: Set[int] = set()
+            for start in _links:
+                if start in _colored:
+                    continue
+                # color the cells strongly linked to the start, alternating the colors along every link
+                _colors: Dict[int, int] = {start: 0}
+                _stack: List[int] = [start]
+                while _stack:
+                    _cell: int = _stack.pop()
+                    for linked in _links[_cell]:
+                        if linked not in _colors:
+                            _colors[linked] = 1 - _colors[_cell]
+                            _stack.append(linked)
+                _colored.update(_colors)
+                _groups: Tuple[List[int], List[int]] = ([], [])
+                for cell, color in _colors.items():
+                    _groups[color].append(cell)
+                # a color with 2 cells that see each other can't hold the candidate
+                _wrapped: bool = False
+                for group in _groups:
+                    if any(not PEER_SETS[cell].isdisjoint(group) for cell in group):
+                        for cell in group:
+                            self.candidates_remove(cell, _bit)
+                        _wrapped = True
+                        break
+                if _wrapped:
+                    continue
+                # a cell that sees both colors can't hold the candidate
+                _seen: List[Set[int]] = [set().union(*(PEER_SETS[cell] for cell in group)) for group in _groups]
+                for cell in _seen[0] & _seen[1]:
+                    if cell not in _colors:
+                        self.candidates_remove(cell, _bit)
+
+    # define the x cycle technique, following the alternating chains of strong and weak links of a candidate
+    # if the start cell doesn't hold the candidate, every cell reached through a strong link does, so any cell that sees
+    # both the start and such a cell can't hold it, and a chain that comes back to the start through a strong link
+    # proves the start holds it
+    def x_cycles(self):
+        for candidate in range(1, 10):
+            _bit: int = DIGIT_MASKS[candidate]
+            _links: Dict[int, Set[int]] = self.strong_links(candidate)
+            for start in list(_links):
+                # the start may have been solved or lost the candidate by an earlier chain
+                if not self.masks[start] & _bit:
+                    continue
+                # follow the chains breadth first, from the cells assumed to be false to the cells then true
+                _false_cells: Set[int] = {start}
+                _true_cells: Set[int] = set()
+                _frontier: List[int] = [start]
+                for _ in range(MAX_CHAIN_LENGTH // 2):
+                    _next_frontier: List[int] = []
+                    for cell in _frontier:
+                        for linked in _links.get(cell, ()):
+                            if linked not in _true_cells:
+                                _true_cells.add(linked)
+                                # a true cell can only be followed on through a weak link to a cell with a strong link
+                                for peer in PEER_SETS[linked] & _links.keys():
+                                    if peer not in _false_cells:
+                                        _false_cells.add(peer)
+                                        _next_frontier.append(peer)
+                    _frontier = _next_frontier
+                    if not _frontier:
+                        break
+                if start in _true_cells:
+                    self.set_solution(start, candidate)
+                    continue
+                for cell in _true_cells:
+                    for test_index in PEER_SETS[start] & PEER_SETS[cell]:
+                        self.candidates_remove(test_index, _bit)
+
+    # define the xy chain technique, following chains of bi value cells
+    # if the start cell isn't one of its candidates, it is the other, which removes that candidate from a bi value
+    # peer, which is then its other candidate, and so on; any cell reached being the first candidate means one of the
+    # 2 cells holds it, so any cell that sees both can't
+    def xy_chains(self):
+        _bi_value_cells: Set[int] = {index for index in range(81) if MASK_SIZES[self.masks[index]] == 2}
+        for start in list(_bi_value_cells):
+            for candidate in MASK_CANDIDATES[self.masks[start]]:
+                # the start may have been solved by an earlier chain
+                if MASK_SIZES[self.masks[start]] != 2:
+                    break
+                _bit: int = DIGIT_MASKS[candidate]
+                # follow the chains breadth first through (cell, candidate the cell then holds) pairs
+                _reached: Set[Tuple[int, int]] = {(start, self.masks[start] & ~_bit)}
+                _frontier: List[Tuple[int, int]] = list(_reached)
+                _ends: Set[int] = set()
+                for _ in range(MAX_CHAIN_LENGTH):
+                    _next_frontier: List[Tuple[int, int]] = []
+                    for cell, held_bit in _frontier:
+                        for peer in PEER_SETS[cell] & _bi_value_cells:
+                            if self.masks[peer] & held_bit:
+                                _peer_bit: int = self.masks[peer] & ~held_bit
+                                if (peer, _peer_bit) not in _reached:
+                                    _reached.add((peer, _peer_bit))
+                                    _next_frontier.append((peer, _peer_bit))
+                                    if _peer_bit == _bit and peer != start:
+                                        _ends.add(peer)
+                    _frontier = _next_frontier
+                    if not _frontier:
+                        break
+                for end in _ends:
+                    for test_index in PEER_SETS[start] & PEER_SETS[end]:
+                        self.candidates_remove(test_index, _bit)
+
+    # define a function that propagates the singles and lone candidates of a speculative branch until they stop
+    # returns False if the branch runs into a contradiction (an unsolved cell left without candidates)
+    def branch_propagate(self) -> bool:
+        while True:
+            _placements: int = self.placements
+            self.single_cand_solve()
+            self.full_grid_lone_candidates()
+            if any(not mask and not solution for mask, solution in zip(self.masks, self.solution)):
+                return False
+            if self.placements == _placements:
+                return True
+
+    # define the forcing chain technique, which tries every candidate of a bi value cell on a fork of the board
+    # a candidate whose branch runs into a contradiction is removed (nishio); otherwise the candidates both branches
+    # removed from a cell are removed from the board, since one of the branches is the truth
+    def forcing_chains(self):
+        for index in [index for index in range(81) if MASK_SIZES[self.masks[index]] == 2]:
+            # the cell may have been solved by an earlier cell
+            if MASK_SIZES[self.masks[index]] != 2:
+                continue
+            _kept_masks: List[List[int]] = []
+            for candidate in MASK_CANDIDATES[self.masks[index]]:
+                _branch: Board = self.fork()
+                _branch.set_solution(index, candidate)
+                if not _branch.branch_propagate():
+                    self.candidate_remove(index, candidate)
+                    continue
+                # the candidates the branch kept in every cell, counting a solution as its only candidate
+                _kept_masks.append([mask | DIGIT_MASKS[solution]
+                                    for mask, solution in zip(_branch.masks, _branch.solution)])
+            # stop at the first cell that changed the board, the cheaper techniques can carry on from there
+            if len(_kept_masks) < 2:
+                return
+            _placements, _eliminations = self.placements, self.eliminations
+            for test_index in range(81):
+                if self.masks[test_index]:
+                    self.candidates_remove(test_index,
+                                           ALL_CANDIDATES & ~(_kept_masks[0][test_index] | _kept_masks[1][test_index]))
+            if self.placements != _placements or self.eliminations != _eliminations:
+                return
+
+    # define the technique scheduler, which always runs the cheapest technique that can still make progress
+    # the techniques are ordered by cost: after any change the scheduler goes back to the cheapest technique,
+    # and only moves on to a more expensive technique when every cheaper one has stopped making changes
+    # returns whether the board was fully solved
+    def general_solver(self, techniques: Optional[List[Callable]] = None) -> bool:
+        # the board's own techniques are used unless another list (such as wrapped or timed techniques) is given
+        _techniques: List[Callable] = techniques or self.solve_techniques
+        _technique_index: int = 0
+        # iterate until the board is solved or every technique has failed in a row
+        while _technique_index < len(_techniques) and not self.is_solved():
+            if self.stop_check is not None and self.stop_check():
+                break
+            _placements, _eliminations = self.placements, self.eliminations
+            if self.stats is None:
+                _techniques[_technique_index]()
+            else:
+                # time the technique and report it to the statistics hook
+                _start: float = time.perf_counter()
+                _techniques[_technique_index]()
+                self.stats.record(_techniques[_technique_index].__name__, time.perf_counter() - _start,
+                                  self.placements - _placements, self.eliminations - _eliminations)
+            # increment the number of iterations performed
+            self.num_iterations += 1
+            if self.trace is not None:
+                self.trace.step_end(_techniques[_technique_index].__name__)
+            if self.placements != _placements or self.eliminations != _eliminations:
+                # record which technique made the change and how big it was
+                self.technique_log.append((_techniques[_technique_index].__name__,
+                                           self.placements - _placements, self.eliminations - _eliminations))
+                # the single candidate technique empties its own queue, so it never needs to run twice in a row
+                _technique_index = 1 if _technique_index == 0 else 0
+            else:
+                _technique_index += 1
+        return self.is_solved()
@@ -1,19 +1,36 @@
 # This file contains the entire Cell class
 
-from typing import List
-from PySide6.QtWidgets import QGraphicsRectItem, QGraphicsTextItem
-from PySide6.QtGui import QFont, QFontMetricsF, QPen
-from PySide6 import QtCore, QtGui
+from typing import List, Optional
+from PySide6.QtWidgets import QGraphicsRectItem, QStyleOptionGraphicsItem, QWidget
+from PySide6.QtGui import QFont, QFontMetricsF, QPainter, QPen
+from PySide6.QtCore import QRectF, Qt
 
 
 class Cell(QGraphicsRectItem):
     # create class variables to represent the row and column indexes in the position list
     COL: int = 0
     ROW: int = 1
+    # the text of every digit, so painting doesn't create new strings
+    DIGIT_TEXT: List[str] = [''] + [str(digit) for digit in range(1, 10)]
+    # create class variables for the fonts, pens, and font metrics shared by every cell (see shared_resources_create)
+    candidate_font: Optional[QFont] = None
+    solution_font: Optional[QFont] = None
+    default_pen: Optional[QPen] = None
+    given_pen: Optional[QPen] = None
+    solution_pen: Optional[QPen] = None
+    line_pen: Optional[QPen] = None
+    font_metrics: Optional[QFontMetricsF] = None
+    # the width and height of a cell, and the rectangle each candidate is drawn in
+    cell_size: float = 0.0
+    candidate_rects: List[QRectF] = []
 
     def __init__(self, parent, cell_number: int):
         # initialize the parent class
         super().__init__(parent)
+        # the grid the cell belongs to, which redraws the changed cells together
+        self.grid = parent
+        # whether the cell has changed since it was last redrawn
+        self.dirty: bool = False
         # the x, y position of the cell
         self.position: List[int] = [0, 0]
         # reassigns the position based on the cell number
@@ -39,52 +56,18 @@ class Cell(QGraphicsRectItem):
         self.shared_block: List[Cell] = []
         # create a list of those shared lists
         self.shared_houses: List[list] = [self.shared_row, self.shared_column, self.shared_block]
-        # create 2 q fonts - 1 for the candidates and 1 for the solutions/givens
-        self.candidate_font: QFont = QFont('Old English Text MT', 8)
-        self.solution_font: QFont = QFont('Old English Text MT', 16)
-        # set the default pen
-        self.default_pen: QPen = QtGui.QPen()
-        # create 3 q pens - 1 for the givens, 1 for the solutions, and 1 for the border
-        self.given_pen: QPen = QtGui.QPen(QtCore.Qt.GlobalColor.darkCyan)
-        self.solution_pen: QPen = QtGui.QPen(QtCore.Qt.GlobalColor.green)
-        self.line_pen: QPen = QtGui.QPen(QtCore.Qt.GlobalColor.darkYellow, 1)
-        self.line_pen.setCosmetic(True)
+        # create the fonts, pens, and font metrics shared by every cell (the first cell creates them)
+        Cell.shared_resources_create()
         # set the pen to the line pen to draw the cell borders in the correct color
-        self.setPen(self.line_pen)
-        # create a variable for the font metrics
-        self._font_metrics = QFontMetricsF(self.candidate_font)
+        self.setPen(Cell.line_pen)
         # get the size of the cell
-        self.setRect(0, 0, self._font_metrics.height() * 5, self._font_metrics.height() * 5)
-        # create a list of 9 Q Graphics Text Items to display the candidates
-        self.display_candidates: List[QGraphicsTextItem] = []
-        # create a temporary variable to add the given and solution text items to the grid
-        self.temp_text_item: QGraphicsTextItem = QGraphicsTextItem(self)
-        # call the function to generate the candidate text items
-        self.candidate_text_generate()
+        self.setRect(0, 0, Cell.cell_size, Cell.cell_size)
 
     # add the string method to print a basic string with all the information about the instance of a cell
     def __str__(self):
         # add all the attributes of the cell to the string
         return f'p:{self.position}g:{self.given}c:{self.candidates}s:{self.solution}b:{self.block}'
 
-    # define a function to generate candidate text items
-    def candidate_text_generate(self):
-        # iterate for all 9 candidates
-        for candidate in range(1, 10):
-            # create the current text item with the string of the candidate, and its parent
-            _candidate_text_item: QGraphicsTextItem = QGraphicsTextItem(str(candidate), self)
-            # set the font of the text item to have all the attributes of a candidate text item
-            _candidate_text_item.setFont(self.candidate_font)
-            # map number of the candidate to its position in the cell rectangle item
-            _candidate_text_item.setPos(
-                    ((candidate - 1) % 3) + ((candidate - 1) % 3) * (3 * self._font_metrics.height() / 2) +
-                    (1 / 4) * self._font_metrics.height(),
-                    ((candidate - 1) // 3) + ((candidate - 1) // 3) * (3 * self._font_metrics.height() / 2) +
-                    (1 / 4) * self._font_metrics.height()
-                )
-            # add the current text item to the list of candidate text items
-            self.display_candidates.append(_candidate_text_item)
-
     @staticmethod
     # create a function that takes one of the positions and simplifies it
     def coord_simplify(a: int) -> int:
@@ -115,10 +98,10 @@ class Cell(QGraphicsRectItem):
         self.solution = solution
         # clear the candidates list
         self.candidates.clear()
-        # create a new text item for the solution in the painted grid
-        self.paint_text_item(solution, self.solution_pen)
+        # redraw the cell with the solution
+        self.refresh()
 
-    # define a function that paints the given of a cell
+    # define a function that sets the given of a cell
     def set_given(self, given: int):
         if given != 0:
             # set the given and solution to the given
@@ -126,38 +109,78 @@ class Cell(QGraphicsRectItem):
             self.solution = given
             # clear the candidates list
             self.candidates.clear()
-            # paint the given text item
-            self.paint_text_item(given, self.given_pen)
-
-    # define a function that paints a given or a solution
-    def paint_text_item(self, sol_or_given: int, pen: QPen):
-        # create the arbitrary text item with the integer value given
-        self.temp_text_item.setPlainText(f'{sol_or_given}')
-        # set the font of the text item
-        self.temp_text_item.setFont(self.solution_font)
-        # choose the correct pen to pain with
-        self.temp_text_item.setDefaultTextColor(pen.color())
-        # position the text item in the cell
-        self.temp_text_item.setPos((self.rect().width() / 2) - (self.temp_text_item.boundingRect().width() / 2),
-                                   (self.rect().height() / 2) - (self.temp_text_item.boundingRect().height() / 2))
-        # show the newly created text item
-        self.temp_text_item.show()
-        # hide the candidates of the cell
-        list(map(QGraphicsTextItem.hide, self.display_candidates))
-
-    # define a method to remove candidates from the instance of the cell and hide the corresponding candidate text item
+            # redraw the cell with the given
+            self.refresh()
+
+    # define a method to remove a candidate from the instance of the cell
     def candidate_remove(self, candidate: int):
         if candidate in self.candidates:
             # remove the candidate from the instance of the cell
             self.candidates.remove(candidate)
-            # hide the corresponding text item
-            self.display_candidates[candidate - 1].hide()
+            # redraw the cell without the candidate
+            self.refresh()
 
     # define a function to show only the candidates that a cell has
     def set_candidates(self, candidates_list: List[int]):
         self.candidates = candidates_list
         self.candidates.sort()
-        # Now show/hide the text.
-        for candidate in range(1, 10):
-            if candidate not in self.candidates:
-                self.display_candidates[candidate - 1].hide()
+        self.refresh()
+
+    # define a method to add a candidate back to the cell
+    def candidate_restore(self, candidate: int):
+        if candidate not in self.candidates:
+            self.candidates.append(candidate)
+            self.candidates.sort()
+            # redraw the cell with the candidate
+            self.refresh()
+
+    # define a function that removes a solution and shows the candidates the cell had before it
+    def clear_solution(self, candidates_list: List[int]):
+        self.solution = 0
+        self.set_candidates(candidates_list)
+
+    # define a function that marks the cell as changed, so the grid redraws it with the other changed cells
+    def refresh(self):
+        if not self.dirty:
+            self.dirty = True
+            self.grid.cell_dirty(self)
+
+    # define the function that draws the border and then the given, solution, or candidates of the cell
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: Optional[QWidget] = None):
+        # draw the border of the cell
+        super().paint(painter, option, widget)
+        if self.solution:
+            # draw the given or solution in the middle of the cell
+            painter.setFont(Cell.solution_font)
+            painter.setPen(Cell.given_pen if self.given else Cell.solution_pen)
+            painter.drawText(self.rect(), Qt.AlignCenter, Cell.DIGIT_TEXT[self.solution])
+        elif self.candidates:
+            # draw every candidate in its own ninth of the cell
+            painter.setFont(Cell.candidate_font)
+            painter.setPen(Cell.default_pen)
+            for candidate in self.candidates:
+                painter.drawText(Cell.candidate_rects[candidate - 1], Qt.AlignCenter, Cell.DIGIT_TEXT[candidate])
+
+    @staticmethod
+    # define a function that creates the fonts, pens, and font metrics shared by every cell
+    # (they can only be created once the application exists, so the first cell creates them)
+    def shared_resources_create():
+        if Cell.cell_size:
+            return
+        # create 2 q fonts - 1 for the candidates and 1 for the solutions/givens
+        Cell.candidate_font = QFont('Old English Text MT', 8)
+        Cell.solution_font = QFont('Old English Text MT', 16)
+        # set the default pen
+        Cell.default_pen = QPen()
+        # create 3 q pens - 1 for the givens, 1 for the solutions, and 1 for the border
+        Cell.given_pen = QPen(Qt.GlobalColor.darkCyan)
+        Cell.solution_pen = QPen(Qt.GlobalColor.green)
+        Cell.line_pen = QPen(Qt.GlobalColor.darkYellow, 1)
+        Cell.line_pen.setCosmetic(True)
+        # create the font metrics and size the cell from them
+        Cell.font_metrics = QFontMetricsF(Cell.candidate_font)
+        Cell.cell_size = Cell.font_metrics.height() * 5
+        # map every candidate to its ninth of the cell
+        _third: float = Cell.cell_size / 3
+        Cell.candidate_rects = [QRectF(((candidate - 1) % 3) * _third, ((candidate - 1) // 3) * _third, _third, _third)
+                                for candidate in range(1, 10)]
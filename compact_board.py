@@ -0,0 +1,84 @@
+# This file contains the compact board, a packed copy of the state of a board for keeping millions of boards in memory
+# (caches, search branches, and batch queues), which converts to and from a Board or the cells of a Grid
+from array import array
+from typing import List
+from board import ALL_CANDIDATES, DIGIT_MASKS, MASK_CANDIDATES, Board
+
+# every cell is packed into 16 bits: the 9 bit candidate mask, then the 4 bit solution, then whether it is a given
+SOLUTION_SHIFT: int = 9
+SOLUTION_BITS: int = 0b1111 << SOLUTION_SHIFT
+GIVEN_FLAG: int = 1 << 13
+
+
+class CompactBoard:
+    # only the packed cells are stored (no attribute dictionary), so a board costs about 300 bytes
+    __slots__ = ('cells',)
+
+    def __init__(self, cells: array):
+        # the packed state of all 81 cells, an array of unsigned 16 bit integers
+        self.cells: array = cells
+
+    # add the string method to print the board as a single string of solutions
+    def __str__(self):
+        return self.solution_string()
+
+    # define a function that packs the candidates, solutions, and givens of all 81 cells
+    @staticmethod
+    def pack(masks: List[int], solution: List[int], given: List[int]) -> 'CompactBoard':
+        return CompactBoard(array('H', (masks[index] | solution[index] << SOLUTION_SHIFT |
+                                        (GIVEN_FLAG if given[index] else 0) for index in range(81))))
+
+    # define a function that packs the state of a board
+    @staticmethod
+    def from_board(board: Board) -> 'CompactBoard':
+        return CompactBoard.pack(board.masks, board.solution, board.given)
+
+    # define a function that packs the state the cells of a grid show (the grid's own board may be further along)
+    @staticmethod
+    def from_cells(cells: list) -> 'CompactBoard':
+        return CompactBoard.pack([0 if cell.solution else sum(DIGIT_MASKS[candidate] for candidate in cell.candidates)
+                                  for cell in cells],
+                                 [cell.solution for cell in cells], [cell.given for cell in cells])
+
+    # define a function that unpacks a board from the bytes of a compact board (2 bytes for every cell)
+    @staticmethod
+    def from_bytes(data: bytes) -> 'CompactBoard':
+        _cells: array = array('H')
+        _cells.frombytes(data)
+        return CompactBoard(_cells)
+
+    # define a function that returns the packed cells as bytes, for storing or sending the board
+    def to_bytes(self) -> bytes:
+        return self.cells.tobytes()
+
+    # define a function that returns a copy of the board
+    def copy(self) -> 'CompactBoard':
+        return CompactBoard(array('H', self.cells))
+
+    # define functions that unpack the candidates, solutions, and givens of all 81 cells
+    def masks(self) -> List[int]:
+        return [packed & ALL_CANDIDATES for packed in self.cells]
+
+    def solution(self) -> List[int]:
+        return [(packed & SOLUTION_BITS) >> SOLUTION_SHIFT for packed in self.cells]
+
+    def given(self) -> List[int]:
+        return [(packed & SOLUTION_BITS) >> SOLUTION_SHIFT if packed & GIVEN_FLAG else 0 for packed in self.cells]
+
+    # define a function that returns the candidates of a cell
+    def candidates(self, index: int) -> tuple:
+        return MASK_CANDIDATES[self.cells[index] & ALL_CANDIDATES]
+
+    # define a function that returns the solutions as a single string (0 for unsolved cells)
+    def solution_string(self) -> str:
+        return ''.join(map(str, self.solution()))
+
+    # define a function that returns the givens as a puzzle string (0 for blank cells)
+    def puzzle_string(self) -> str:
+        return ''.join(map(str, self.given()))
+
+    # define a function that creates a board with the packed state, ready to carry on solving
+    def to_board(self, record_trace: bool = False) -> Board:
+        _board: Board = Board('0' * 81, record_trace)
+        _board.state_load(self.masks(), self.solution(), self.given())
+        return _board
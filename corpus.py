@@ -0,0 +1,197 @@
+# This file contains the packed binary puzzle corpus: a small header, then fixed size records of 81 cells packed 2 to a
+# byte (with an optional solution block and an optional rating), read through a memory map without copying
+# any record can be found in O(1) from its number, so worker processes can open the same corpus and each read a slice
+import argparse
+import mmap
+import struct
+import sys
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+from batch_solve import puzzle_read
+
+# the header: the magic bytes, the format version, the flags of the optional blocks, the record size, and the number
+# of records, padded to 16 bytes
+HEADER_FORMAT: struct.Struct = struct.Struct('<4sBBHI4x')
+MAGIC: bytes = b'SDKC'
+VERSION: int = 1
+# the flags of the optional blocks every record has
+HAS_SOLUTION: int = 1
+HAS_RATING: int = 2
+# the number of bytes of 81 cells packed 2 to a byte (the first cell of every pair is the high nibble)
+PACKED_SIZE: int = 41
+# the rating block: the score in hundredths and the flags of the puzzle
+RATING_FORMAT: struct.Struct = struct.Struct('<HH')
+# the flags of a rated puzzle
+SOLVED_BY_LOGIC_FLAG: int = 1
+# create the table from an ascii digit ('.' is a blank cell) to its value, for packing
+DIGIT_VALUES: bytes = bytes.maketrans(b'.0123456789', bytes(1) + bytes(range(10)))
+# create the table from a packed byte to the text of its 2 cells, for unpacking
+PAIR_TEXT: List[str] = [f'{pair >> 4}{pair & 15}' for pair in range(256)]
+
+
+class CorpusRating(NamedTuple):
+    # the score of the puzzle (see rating.py)
+    score: float
+    # whether the technique ladder solved the puzzle without search
+    solved: bool
+
+
+# define a function that returns the size of a record with the optional blocks of the flags
+def record_size(flags: int) -> int:
+    return PACKED_SIZE + (PACKED_SIZE if flags & HAS_SOLUTION else 0) + \
+        (RATING_FORMAT.size if flags & HAS_RATING else 0)
+
+
+# define a function that packs an 81 character grid into 41 bytes
+def grid_pack(grid: str) -> bytes:
+    _values: bytes = grid.encode('ascii').translate(DIGIT_VALUES) + bytes(1)
+    return bytes(_values[index] << 4 | _values[index + 1] for index in range(0, 82, 2))
+
+
+# define a function that unpacks 41 bytes into an 81 character grid ('0' for blank cells)
+def grid_unpack(packed: memoryview) -> str:
+    return ''.join(map(PAIR_TEXT.__getitem__, packed))[:81]
+
+
+# define a function that writes a corpus from (puzzle, solution) pairs, returns the number of records written
+# the solution block can be left out, and the ratings are only made if asked for
+def corpus_write(pairs: Iterator[Tuple[str, str]], output_stream: BinaryIO, solutions: bool = True,
+                 ratings: bool = False) -> int:
+    _flags: int = (HAS_SOLUTION if solutions else 0) | (HAS_RATING if ratings else 0)
+    if ratings:
+        # the rating engine is only needed for rated corpora, so it is imported here
+        from rating import puzzle_rate
+    # the number of records is only known at the end, so the header is written again then
+    _start: int = output_stream.tell()
+    output_stream.write(HEADER_FORMAT.pack(MAGIC, VERSION, _flags, record_size(_flags), 0))
+    _count: int = 0
+    for puzzle, solution in pairs:
+        output_stream.write(grid_pack(puzzle))
+        if solutions:
+            # a puzzle without a known solution gets a blank solution block
+            output_stream.write(grid_pack(solution or '0' * 81))
+        if ratings:
+            _rating = puzzle_rate(puzzle)
+            output_stream.write(RATING_FORMAT.pack(min(round(_rating.score * 100), 0xFFFF),
+                                                   SOLVED_BY_LOGIC_FLAG if _rating.solved else 0))
+        _count += 1
+    _end: int = output_stream.tell()
+    output_stream.seek(_start)
+    output_stream.write(HEADER_FORMAT.pack(MAGIC, VERSION, _flags, record_size(_flags), _count))
+    output_stream.seek(_end)
+    return _count
+
+
+class Corpus:
+    def __init__(self, path: str):
+        # map the whole file read only, the pages are shared by every process that maps it
+        with open(path, 'rb') as corpus_file:
+            self.map: mmap.mmap = mmap.mmap(corpus_file.fileno(), 0, access=mmap.ACCESS_READ)
+        _magic, _version, self.flags, self.record_size, self.count = \
+            HEADER_FORMAT.unpack_from(self.map) if len(self.map) >= HEADER_FORMAT.size else (b'', 0, 0, 0, 0)
+        if _magic != MAGIC or _version != VERSION or self.record_size != record_size(self.flags) or \
+                len(self.map) < HEADER_FORMAT.size + self.count * self.record_size:
+            self.map.close()
+            raise ValueError(f'{path} is not a version {VERSION} puzzle corpus')
+        # the view every record is sliced from without copying
+        self.view: memoryview = memoryview(self.map)
+
+    def __len__(self):
+        return self.count
+
+    # define a function that returns the bytes of a record, without copying
+    def record(self, number: int) -> memoryview:
+        if not 0 <= number < self.count:
+            raise IndexError(f'record {number} is outside the corpus of {self.count} records')
+        _offset: int = HEADER_FORMAT.size + number * self.record_size
+        return self.view[_offset:_offset + self.record_size]
+
+    # define a function that returns the puzzle of a record ('0' for blank cells)
+    def puzzle(self, number: int) -> str:
+        return grid_unpack(self.record(number)[:PACKED_SIZE])
+
+    # define a function that returns the solution of a record, None if the corpus has no solutions or the solution of
+    # the puzzle is not known (a blank solution block)
+    def solution(self, number: int) -> Optional[str]:
+        if not self.flags & HAS_SOLUTION:
+            return None
+        _packed: memoryview = self.record(number)[PACKED_SIZE:2 * PACKED_SIZE]
+        return grid_unpack(_packed) if any(_packed) else None
+
+    # define a function that returns the rating of a record, None if the corpus has no ratings
+    def rating(self, number: int) -> Optional[CorpusRating]:
+        if not self.flags & HAS_RATING:
+            return None
+        _score, _flags = RATING_FORMAT.unpack_from(self.record(number), self.record_size - RATING_FORMAT.size)
+        return CorpusRating(_score / 100, bool(_flags & SOLVED_BY_LOGIC_FLAG))
+
+    # define a generator that yields the (puzzle, solution) pairs of a range of records, like puzzle_read
+    # (the solution is '' if the corpus has no solutions)
+    def pairs(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[str, str]]:
+        for number in range(start, self.count if stop is None else min(stop, self.count)):
+            yield self.puzzle(number), self.solution(number) or ''
+
+    # define a function that returns a range of records as an (N, record size) NumPy array of bytes, without copying
+    # (the array keeps the memory map open, so it must be deleted before the corpus is closed)
+    def records_array(self, start: int = 0, stop: Optional[int] = None):
+        # NumPy is only needed for the array views, so it is imported here
+        import numpy as np
+        _stop: int = self.count if stop is None else min(stop, self.count)
+        return np.frombuffer(self.map, dtype=np.uint8, count=max(0, _stop - start) * self.record_size,
+                             offset=HEADER_FORMAT.size + start * self.record_size).reshape(-1, self.record_size)
+
+    # define a function that unpacks the puzzles of a range of records into an (N, 81) NumPy array of digits
+    # (0 for blank cells), the input of batch_propagate
+    def puzzles_array(self, start: int = 0, stop: Optional[int] = None):
+        import numpy as np
+        _packed = self.records_array(start, stop)[:, :PACKED_SIZE]
+        return np.stack((_packed >> 4, _packed & 15), axis=2).reshape(len(_packed), 2 * PACKED_SIZE)[:, :81]
+
+    # define a function that closes the memory map (every record view and array must be released first)
+    def close(self):
+        self.view.release()
+        self.map.close()
+
+
+# define the command line entry point: convert a text corpus to a packed corpus, or write a packed corpus as text
+def main(argv: Optional[List[str]] = None) -> int:
+    _parser = argparse.ArgumentParser(description='Convert sudoku corpora between text and the packed binary format.')
+    _commands = _parser.add_subparsers(dest='command', required=True)
+    _convert = _commands.add_parser('convert', help='pack a text corpus (in any layout batch_solve.py reads)')
+    _convert.add_argument('input', help="file of puzzles ('-' reads stdin)")
+    _convert.add_argument('output', help='file for the packed corpus')
+    _convert.add_argument('--no-solutions', action='store_true', help='leave out the solution block')
+    _convert.add_argument('--ratings', action='store_true', help='rate every puzzle and add the rating block')
+    _dump = _commands.add_parser('dump', help='write the records of a packed corpus as text, one line each')
+    _dump.add_argument('input', help='file of the packed corpus')
+    _dump.add_argument('--start', type=int, default=0, help='number of the first record')
+    _dump.add_argument('--stop', type=int, help='number of the record after the last one')
+    _arguments = _parser.parse_args(argv)
+    if _arguments.command == 'convert':
+        _input_stream: TextIO = sys.stdin if _arguments.input == '-' else open(_arguments.input, 'r')
+        try:
+            with open(_arguments.output, 'wb') as output_stream:
+                _count: int = corpus_write(puzzle_read(_input_stream), output_stream, not _arguments.no_solutions,
+                                           _arguments.ratings)
+        finally:
+            if _input_stream is not sys.stdin:
+                _input_stream.close()
+        print(f'records: {_count}', file=sys.stderr)
+        return 0
+    _corpus: Corpus = Corpus(_arguments.input)
+    try:
+        for number in range(_arguments.start, len(_corpus) if _arguments.stop is None else
+                            min(_arguments.stop, len(_corpus))):
+            _columns: List[str] = [_corpus.puzzle(number)]
+            if _corpus.flags & HAS_SOLUTION:
+                _columns.append(_corpus.solution(number) or '0' * 81)
+            if _corpus.flags & HAS_RATING:
+                _rating: CorpusRating = _corpus.rating(number)
+                _columns.append(f'{_rating.score:.2f}')
+            sys.stdout.write(' '.join(_columns) + '\n')
+    finally:
+        _corpus.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
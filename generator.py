@@ -0,0 +1,156 @@
+# This file contains the puzzle generator: random full grids, clue removal that keeps the solution unique,
+# and technique targeting through the technique ladder
+import argparse
+import os
+import random
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Deque, List, Optional, TextIO, Tuple
+from board import ALL_CANDIDATES, DIGIT_MASKS
+from rating import TECHNIQUE_NAMES, puzzle_rate
+from search import search_place, search_solutions
+
+
+# define a function that creates a random full grid
+def random_grid(generator: random.Random) -> List[int]:
+    return next(search_solutions([ALL_CANDIDATES] * 81, [0] * 81, generator))
+
+
+# define a function that checks whether the givens have a solution with a different digit in a cell
+# (the givens are known to have a solution with the digit in the cell)
+def alternative_exists(givens: List[int], index: int, digit: int) -> bool:
+    _masks: List[int] = [ALL_CANDIDATES] * 81
+    _solution: List[int] = [0] * 81
+    for cell, given in enumerate(givens):
+        # propagation may already have placed the given
+        if given and not _solution[cell]:
+            search_place(_masks, _solution, cell, given)
+    # propagation alone forced the digit into the cell
+    if _solution[index]:
+        return False
+    _masks[index] &= ~DIGIT_MASKS[digit]
+    return next(search_solutions(_masks, _solution), None) is not None
+
+
+# define a function that creates a random puzzle with a unique solution, where no clue can be removed
+# returns the puzzle and its solution as strings
+def puzzle_generate(generator: random.Random) -> Tuple[str, str]:
+    _grid: List[int] = random_grid(generator)
+    _givens: List[int] = _grid[:]
+    _order: List[int] = list(range(81))
+    generator.shuffle(_order)
+    for index in _order:
+        _digit: int = _givens[index]
+        _givens[index] = 0
+        # put the clue back if the puzzle would have another solution without it
+        if alternative_exists(_givens, index, _digit):
+            _givens[index] = _digit
+    return ''.join(map(str, _givens)), ''.join(map(str, _grid))
+
+
+# define a function that makes a range of attempts, each from its own generator seeded by the seed and attempt number
+# (so the same seed creates the same puzzles whatever the number of workers)
+# returns the attempt number, puzzle, solution, and hardest technique of every puzzle that matches the target
+# (None matches every puzzle)
+def attempts_run(seed: int, first_attempt: int, attempts: int, target: Optional[str]) -> \
+        List[Tuple[int, str, str, str]]:
+    _puzzles: List[Tuple[int, str, str, str]] = []
+    for attempt in range(first_attempt, first_attempt + attempts):
+        _puzzle, _solution = puzzle_generate(random.Random(f'{seed}:{attempt}'))
+        _technique: str = puzzle_rate(_puzzle).hardest
+        if target is None or _technique == target:
+            _puzzles.append((attempt, _puzzle, _solution, _technique))
+    return _puzzles
+
+
+# define a function that generates puzzles until there are enough that match the target, writing one line each
+# each line is the puzzle, its solution, and its hardest technique
+# the attempts are made in chunks across the worker processes, and the puzzles are written in attempt order
+# generating stops early once the most attempts allowed have been made (None allows any number, a rare target could
+# otherwise never be found), and the progress function is told the puzzles written and attempts made after every chunk
+# returns the number of puzzles written and the number of attempts made
+def puzzles_write(output_stream: TextIO, count: int, target: Optional[str] = None, seed: int = 0, workers: int = 1,
+                  chunk_size: int = 16, max_attempts: Optional[int] = None,
+                  progress: Optional[Callable[[int, int], None]] = None) -> Tuple[int, int]:
+    _written: int = 0
+    _attempt: int = 0
+
+    # define a function that returns the number of attempts of the next chunk (0 once the attempts are used up)
+    def _chunk_attempts() -> int:
+        return chunk_size if max_attempts is None else max(0, min(chunk_size, max_attempts - _attempt))
+
+    # a single worker makes the attempts in this process
+    if workers <= 1:
+        while _written < count and _chunk_attempts():
+            _attempts: int = _chunk_attempts()
+            for _, puzzle, solution, technique in attempts_run(seed, _attempt, _attempts, target)[:count - _written]:
+                output_stream.write(f'{puzzle} {solution} {technique}\n')
+                _written += 1
+            _attempt += _attempts
+            if progress is not None:
+                progress(_written, _attempt)
+        return _written, _attempt
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # create the queue of chunks of attempts in flight, oldest first, with the number of attempts of each
+        # (2 per worker keeps every worker busy)
+        _in_flight: Deque[Tuple[Future, int]] = deque()
+        _looked_at: int = 0
+        while _written < count:
+            while len(_in_flight) < 2 * workers and _chunk_attempts():
+                _attempts = _chunk_attempts()
+                _in_flight.append((executor.submit(attempts_run, seed, _attempt, _attempts, target), _attempts))
+                _attempt += _attempts
+            if not _in_flight:
+                break
+            _future, _attempts = _in_flight.popleft()
+            for _, puzzle, solution, technique in _future.result()[:count - _written]:
+                output_stream.write(f'{puzzle} {solution} {technique}\n')
+                _written += 1
+            _looked_at += _attempts
+            if progress is not None:
+                progress(_written, _looked_at)
+        # the attempts still in flight aren't needed
+        for future, _ in _in_flight:
+            future.cancel()
+        # only count the attempts whose puzzles were looked at
+        return _written, _looked_at
+
+
+# define the command line entry point
+def main(argv: Optional[List[str]] = None) -> int:
+    _parser = argparse.ArgumentParser(description='Generate sudoku puzzles with unique solutions.')
+    _parser.add_argument('-n', '--count', type=int, default=100, help='number of puzzles to generate')
+    _parser.add_argument('-t', '--target', choices=TECHNIQUE_NAMES,
+                         help='only keep puzzles whose hardest technique is this one')
+    _parser.add_argument('-s', '--seed', type=int, default=0, help='seed of the generated puzzles')
+    _parser.add_argument('-o', '--output', default='-', help="file for the puzzles ('-' or nothing writes stdout)")
+    _parser.add_argument('-w', '--workers', type=int, default=1,
+                         help='number of worker processes (0 uses every core, 1 generates in this process)')
+    _parser.add_argument('-c', '--chunk-size', type=int, default=16,
+                         help='number of attempts sent to a worker per task')
+    _parser.add_argument('-m', '--max-attempts', type=int, default=10000,
+                         help='stop after this many attempts even if fewer puzzles were found (0 for no limit)')
+    _parser.add_argument('-q', '--quiet', action='store_true', help='do not report the progress while generating')
+    _arguments = _parser.parse_args(argv)
+    _output_stream: TextIO = sys.stdout if _arguments.output == '-' else open(_arguments.output, 'w')
+    # the progress goes to stderr on a single line, so it never mixes with the puzzles
+    _progress: Optional[Callable[[int, int], None]] = None if _arguments.quiet else \
+        lambda written, attempts: print(f'\rfound: {written}/{_arguments.count}  attempts: {attempts}', end='',
+                                        file=sys.stderr, flush=True)
+    try:
+        _written, _attempts = puzzles_write(_output_stream, _arguments.count, _arguments.target, _arguments.seed,
+                                            _arguments.workers or os.cpu_count() or 1, max(1, _arguments.chunk_size),
+                                            _arguments.max_attempts or None, _progress)
+    finally:
+        if _output_stream is not sys.stdout:
+            _output_stream.close()
+    if _progress is not None:
+        print(file=sys.stderr)
+    print(f'puzzles: {_written} of {_arguments.count}  attempts: {_attempts}', file=sys.stderr)
+    # finding fewer puzzles than asked for (the attempts ran out) is a failure
+    return 0 if _written == _arguments.count else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
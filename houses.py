@@ -0,0 +1,51 @@
+# This file contains the house and peer tables shared by every board, built once when the module is imported
+from typing import List, Tuple
+
+# the house numbers are 0 - 8 for the rows, 9 - 17 for the columns, and 18 - 26 for the blocks
+ROW_HOUSES: range = range(0, 9)
+COL_HOUSES: range = range(9, 18)
+BLOCK_HOUSES: range = range(18, 27)
+
+# create the tables of the row, column, and block number (0 - 8) of every cell
+CELL_ROW: Tuple[int, ...] = tuple(index // 9 for index in range(81))
+CELL_COL: Tuple[int, ...] = tuple(index % 9 for index in range(81))
+CELL_BLOCK: Tuple[int, ...] = tuple(3 * (index // 27) + (index % 9) // 3 for index in range(81))
+
+# create the table of the 3 house numbers (row, column, block) of every cell
+CELL_HOUSES: Tuple[Tuple[int, int, int], ...] = tuple((CELL_ROW[index], 9 + CELL_COL[index], 18 + CELL_BLOCK[index])
+                                                      for index in range(81))
+
+# create the table of the 9 cell indexes in each of the 27 houses
+HOUSES: Tuple[Tuple[int, ...], ...] = tuple(tuple(index for index in range(81) if house in CELL_HOUSES[index])
+                                            for house in range(27))
+
+# create the table of the 3 house numbers of every cell each followed by the position bit of the cell in that house,
+# the position bit being the bit of the cell in a 9 bit mask of the positions in the house (bit p for position p)
+CELL_HOUSE_BITS: Tuple[Tuple[int, int, int, int, int, int], ...] = tuple(
+    tuple(value for house in CELL_HOUSES[index] for value in (house, 1 << HOUSES[house].index(index)))
+    for index in range(81))
+
+# create the tables of the 20 peers (cells sharing any house) of every cell, as a sorted tuple and as a set
+PEER_SETS: Tuple[frozenset, ...] = tuple(frozenset(peer for house in CELL_HOUSES[index] for peer in HOUSES[house]
+                                                   if peer != index) for index in range(81))
+PEERS: Tuple[Tuple[int, ...], ...] = tuple(tuple(sorted(peer_set)) for peer_set in PEER_SETS)
+
+
+# define a function that builds the intersections of a group of line houses with the blocks
+# every intersection is (line house, block house, the 3 shared cells, the 6 line-only cells, the 6 block-only cells)
+def _intersections_generate(line_houses: range) -> List[Tuple[int, int, tuple, tuple, tuple]]:
+    _intersections: List[Tuple[int, int, tuple, tuple, tuple]] = []
+    for line in line_houses:
+        for block in BLOCK_HOUSES:
+            _shared: tuple = tuple(index for index in HOUSES[line] if index in HOUSES[block])
+            # only lines that cross the block have an intersection
+            if _shared:
+                _intersections.append((line, block, _shared,
+                                       tuple(index for index in HOUSES[line] if index not in _shared),
+                                       tuple(index for index in HOUSES[block] if index not in _shared)))
+    return _intersections
+
+
+# create the tables of the 27 row-block and 27 column-block intersections
+ROW_BLOCK_INTERSECTIONS: Tuple[Tuple[int, int, tuple, tuple, tuple], ...] = tuple(_intersections_generate(ROW_HOUSES))
+COL_BLOCK_INTERSECTIONS: Tuple[Tuple[int, int, tuple, tuple, tuple], ...] = tuple(_intersections_generate(COL_HOUSES))
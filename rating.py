@@ -0,0 +1,122 @@
+# This file contains the difficulty rating engine, which rates puzzles headlessly through the technique ladder
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional, TextIO, Tuple
+from board import Board
+from batch_solve import SolveOptions, chunk_read, chunk_results, puzzle_read
+from search import solution_conflicts
+
+# the name of the hardest technique of a puzzle the technique ladder can't finish
+SEARCH_TECHNIQUE: str = 'search'
+# the names of the techniques of the ladder, in ladder order, then search
+TECHNIQUE_NAMES: List[str] = [technique.__name__ for technique in Board('0' * 81).solve_techniques] + \
+    [SEARCH_TECHNIQUE]
+# the difficulty of every technique (a puzzle the ladder can't finish gets the difficulty of search)
+TECHNIQUE_DIFFICULTIES: Dict[str, float] = {'single_cand_solve': 1.0, 'full_grid_lone_candidates': 1.5,
+                                            'subset_pairs_full_grid': 3.0, 'pointing_pairs_full_grid': 3.5,
+                                            'subset_triples_quads_full_grid': 4.0,
+                                            'bi_value_graveyard': 5.0, 'x_wing': 6.0, 'y_wing': 6.5,
+                                            'xyz_wing': 6.7, 'simple_coloring': 6.8, 'swordfish': 7.0,
+                                            'jellyfish': 8.0, 'wxyz_wing': 7.6, 'x_cycles': 7.5, 'xy_chains': 7.8,
+                                            'forcing_chains': 8.5, SEARCH_TECHNIQUE: 10.0}
+# the part of the score that comes from every step (so of 2 puzzles with the same hardest technique, the one that
+# needs more hard steps scores higher)
+STEP_WEIGHT: float = 0.01
+
+
+class Rating(NamedTuple):
+    # the hardest technique the puzzle needed ('search' if the ladder couldn't finish it)
+    hardest: str
+    # the number of steps every technique changed the board, in ladder order
+    fires: Dict[str, int]
+    # the total number of steps that changed the board
+    steps: int
+    # the score: the difficulty of the hardest technique plus a small part for every step
+    score: float
+    # whether the technique ladder solved the puzzle
+    solved: bool
+
+
+# define a function that rates a board through the technique ladder, using logic only
+# (a filled grid whose givens break the rules is not solved, it is rated as needing search like a stalled one)
+def board_rate(board: Board) -> Rating:
+    _solved: bool = board.general_solver() and not solution_conflicts(board)
+    _fires: Dict[str, int] = {}
+    for name, _, _ in board.technique_log:
+        _fires[name] = _fires.get(name, 0) + 1
+    _hardest: str = SEARCH_TECHNIQUE if not _solved else \
+        max(_fires, key=TECHNIQUE_DIFFICULTIES.__getitem__, default=TECHNIQUE_NAMES[0])
+    _score: float = TECHNIQUE_DIFFICULTIES[_hardest] + \
+        STEP_WEIGHT * sum(TECHNIQUE_DIFFICULTIES[name] * fires for name, fires in _fires.items())
+    return Rating(_hardest, dict(sorted(_fires.items(), key=lambda item: TECHNIQUE_NAMES.index(item[0]))),
+                  len(board.technique_log), round(_score, 2), _solved)
+
+
+# define a function that rates a single puzzle
+def puzzle_rate(puzzle: str) -> Rating:
+    return board_rate(Board(puzzle))
+
+
+# define a function that rates a chunk of puzzles, returns the rating of every puzzle in order
+# (it takes the solve options like chunk_solve, so chunks can be spread across workers the same way)
+def chunk_rate(puzzles: List[str], options: SolveOptions = SolveOptions()) -> List[Rating]:
+    return [puzzle_rate(puzzle) for puzzle in puzzles]
+
+
+# define a function that returns a rating as a printable result line
+def rating_string(puzzle: str, rating: Rating) -> str:
+    _fires: str = ','.join(f'{name}:{fires}' for name, fires in rating.fires.items())
+    return f'{puzzle} {rating.score:.2f} {rating.hardest} {rating.steps} {_fires}'
+
+
+# define a function that rates every puzzle of the input and writes one result line each
+# each result line is the puzzle, the score, the hardest technique, the number of steps, and the fires of every
+# technique, written in input order
+# returns the number of puzzles rated by their hardest technique
+def batch_rate(input_stream: TextIO, output_stream: TextIO, workers: int = 1, chunk_size: int = 64) -> Dict[str, int]:
+    _hardest_counts: Dict[str, int] = {name: 0 for name in TECHNIQUE_NAMES}
+    _chunks = chunk_read(puzzle_read(input_stream), chunk_size)
+    for chunk, ratings in chunk_results(_chunks, workers, SolveOptions(), chunk_rate):
+        for (puzzle, _), rating in zip(chunk, ratings):
+            _hardest_counts[rating.hardest] += 1
+            output_stream.write(rating_string(puzzle, rating) + '\n')
+    return _hardest_counts
+
+
+# define the command line entry point
+def main(argv: Optional[List[str]] = None) -> int:
+    _parser = argparse.ArgumentParser(description='Rate the difficulty of sudoku puzzles through the technique ladder.')
+    _parser.add_argument('input', nargs='?', default='-',
+                         help="file of puzzles, one 81 character line each ('-' or nothing reads stdin)")
+    _parser.add_argument('-o', '--output', default='-', help="file for the ratings ('-' or nothing writes stdout)")
+    _parser.add_argument('-w', '--workers', type=int, default=1,
+                         help='number of worker processes (0 uses every core, 1 rates in this process)')
+    _parser.add_argument('-c', '--chunk-size', type=int, default=64,
+                         help='number of puzzles sent to a worker per task')
+    _arguments = _parser.parse_args(argv)
+    _input_stream: TextIO = sys.stdin if _arguments.input == '-' else open(_arguments.input, 'r')
+    _output_stream: TextIO = sys.stdout if _arguments.output == '-' else open(_arguments.output, 'w')
+    _start: float = time.perf_counter()
+    try:
+        _hardest_counts: Dict[str, int] = batch_rate(_input_stream, _output_stream,
+                                                     _arguments.workers or os.cpu_count() or 1,
+                                                     max(1, _arguments.chunk_size))
+    finally:
+        if _input_stream is not sys.stdin:
+            _input_stream.close()
+        if _output_stream is not sys.stdout:
+            _output_stream.close()
+    # the summary goes to stderr so it never mixes with the ratings
+    _elapsed: float = time.perf_counter() - _start
+    _total: int = sum(_hardest_counts.values())
+    _counts: List[Tuple[str, int]] = [(name, count) for name, count in _hardest_counts.items() if count]
+    print(f'puzzles: {_total}  elapsed: {_elapsed:.3f} s  throughput: '
+          f'{_total / _elapsed if _elapsed > 0 else 0.0:.1f} puzzles/sec', file=sys.stderr)
+    print('hardest: ' + '  '.join(f'{name}: {count}' for name, count in _counts), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+# This file contains the backtracking search that finishes any board the solving techniques leave unsolved
+import random
+import time
+from itertools import islice
+from typing import Iterator, List, Optional
+from board import Board, DIGIT_MASKS, MASK_CANDIDATES, MASK_SIZES
+from houses import PEERS
+
+# the ways a board can be finished
+SOLVED_BY_LOGIC: str = 'logic'
+SOLVED_BY_SEARCH: str = 'search'
+NO_SOLUTION: str = 'none'
+# the number of solutions counting stops at: past 1 solution the count only matters as 'more than 1'
+COUNT_LIMIT: int = 2
+
+
+# define a function that places a digit in a copy of the search state and propagates the single candidates
+# returns False if the placement leaves an unsolved cell without candidates
+def search_place(masks: List[int], solution: List[int], index: int, digit: int) -> bool:
+    # create the queue of placements still to be propagated
+    _queue: List[int] = [index]
+    solution[index] = digit
+    masks[index] = 0
+    while _queue:
+        _placed: int = _queue.pop()
+        _bit: int = DIGIT_MASKS[solution[_placed]]
+        # remove the digit from every peer
+        for peer in PEERS[_placed]:
+            if masks[peer] & _bit:
+                masks[peer] ^= _bit
+                # a peer left without candidates is a contradiction
+                if not masks[peer]:
+                    return False
+                # a peer left with a single candidate is placed straight away
+                if MASK_SIZES[masks[peer]] == 1:
+                    solution[peer] = MASK_CANDIDATES[masks[peer]][0]
+                    masks[peer] = 0
+                    _queue.append(peer)
+            # a solved peer with the same digit is a contradiction
+            elif solution[peer] == solution[_placed]:
+                return False
+    return True
+
+
+# define a generator that yields every solution reachable from a search state, branching on the most constrained cell
+# with a random generator, the candidates of each cell are tried in a random order (for creating random grids)
+def search_solutions(masks: List[int], solution: List[int], generator: Optional[random.Random] = None) -> \
+        Iterator[List[int]]:
+    # find the unsolved cell with the fewest candidates
+    _best_index: int = -1
+    _best_size: int = 10
+    for index in range(81):
+        if not solution[index]:
+            _size: int = MASK_SIZES[masks[index]]
+            # an unsolved cell without candidates has no solution
+            if _size == 0:
+                return
+            if _size < _best_size:
+                _best_index, _best_size = index, _size
+                # a cell with 2 candidates is the best that can be found
+                if _size == 2:
+                    break
+    # with every cell solved, the state is a solution
+    if _best_index == -1:
+        yield solution
+        return
+    # try every candidate of the cell on a copy of the state
+    _digits: List[int] = list(MASK_CANDIDATES[masks[_best_index]])
+    if generator is not None:
+        generator.shuffle(_digits)
+    for digit in _digits:
+        _masks: List[int] = masks[:]
+        _solution: List[int] = solution[:]
+        if search_place(_masks, _solution, _best_index, digit):
+            yield from search_solutions(_masks, _solution, generator)
+
+
+# define a function that checks whether any 2 solved cells of a board that see each other have the same digit
+def solution_conflicts(board: Board) -> bool:
+    return any(board.solution[index] and any(board.solution[peer] == board.solution[index] for peer in PEERS[index])
+               for index in range(81))
+
+
+# define a function that finds the first solution of a board by search, starting from the candidates it has left
+def search_first_solution(board: Board) -> Optional[List[int]]:
+    if solution_conflicts(board):
+        return None
+    return next(search_solutions(board.masks[:], board.solution[:]), None)
+
+
+# define a function that counts the solutions of a board by search, stopping as soon as the limit is reached
+# (so a puzzle with many solutions costs no more than finding 2 of them)
+def solutions_count(board: Board, limit: int = COUNT_LIMIT) -> int:
+    if solution_conflicts(board):
+        return 0
+    return sum(1 for _ in islice(search_solutions(board.masks[:], board.solution[:]), limit))
+
+
+# define a function that returns a solution count as a printable string ('2+' for a count that reached the limit)
+def count_string(count: int, limit: int = COUNT_LIMIT) -> str:
+    return f'{limit}+' if count >= limit else str(count)
+
+
+# define a function that finishes a board with the solving techniques, then with search if the techniques stall
+# returns whether logic alone was enough, search was needed, or the board has no solution
+def complete_solve(board: Board) -> str:
+    if board.general_solver():
+        # a complete grid can still break the rules (such as givens with a duplicate digit), which is no solution
+        return NO_SOLUTION if solution_conflicts(board) else SOLVED_BY_LOGIC
+    _start: float = time.perf_counter()
+    _placements, _eliminations = board.placements, board.eliminations
+    _solution: Optional[List[int]] = search_first_solution(board)
+    if _solution is not None:
+        # copy the solutions found by search onto the board
+        for index in range(81):
+            if not board.solution[index]:
+                board.set_solution(index, _solution[index])
+    # report the search to the trace and the statistics hook like any other technique
+    if board.trace is not None:
+        board.trace.step_end('search')
+    if board.stats is not None:
+        board.stats.record('search', time.perf_counter() - _start,
+                           board.placements - _placements, board.eliminations - _eliminations)
+    return NO_SOLUTION if _solution is None else SOLVED_BY_SEARCH
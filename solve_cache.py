@@ -0,0 +1,239 @@
+# This file contains the cache of solved puzzles, keyed by a canonical form that is the same for every puzzle
+# equivalent under relabeling the digits, reordering rows and columns inside bands and stacks, reordering the bands
+# and stacks, and transposing
+import json
+import sqlite3
+from array import array
+from collections import OrderedDict
+from itertools import permutations, product
+from typing import Collection, List, NamedTuple, Optional, Tuple
+
+# the largest number of transforms still tied while finding a canonical form, past which the puzzle is too symmetric
+# (nearly empty) to be worth canonicalizing, and is not cached
+MAX_TIED_TRANSFORMS: int = 50000
+
+# create every column order: each order of the stacks, with each order of the columns inside every stack
+# column j of a transformed grid is column COLUMN_ORDERS[n][j] of the original grid
+COLUMN_ORDERS: List[Tuple[int, ...]] = [tuple(3 * stack_order[stack] + inner_orders[stack][col]
+                                              for stack in range(3) for col in range(3))
+                                        for stack_order in permutations(range(3))
+                                        for inner_orders in product(permutations(range(3)), repeat=3)]
+# the table from a column order and a row of givens (bit c set for a given in column c) to the value of the row once
+# the columns are reordered (column 0 is the highest bit, so a smaller value has its blanks further left)
+# it is only created the first time a canonical form is needed
+_row_values: List[array] = []
+# the table from a row of givens to its smallest value under any column order and the column orders that reach it,
+# which saves trying every column order on the first row
+_first_row_ties: List[Tuple[int, List[int]]] = []
+
+
+# define a function that creates the table of row values under every column order
+def row_values_generate() -> List[array]:
+    if not _row_values:
+        # create the value of every 3 bit piece of a row under every order of its 3 columns
+        _piece_values: dict = {order: [sum(((piece >> order[col]) & 1) << (2 - col) for col in range(3))
+                                       for piece in range(8)]
+                               for order in permutations(range(3))}
+        for stack_order in permutations(range(3)):
+            for inner_orders in product(permutations(range(3)), repeat=3):
+                # create the value of every piece of the row, in its new stack position
+                _pieces: List[List[int]] = [[value << 3 * (2 - stack) for value in _piece_values[inner_orders[stack]]]
+                                            for stack in range(3)]
+                _row_values.append(array('H', (_pieces[0][(mask >> 3 * stack_order[0]) & 7] +
+                                               _pieces[1][(mask >> 3 * stack_order[1]) & 7] +
+                                               _pieces[2][(mask >> 3 * stack_order[2]) & 7]
+                                               for mask in range(512))))
+        for mask in range(512):
+            _values: List[int] = [values[mask] for values in _row_values]
+            _smallest: int = min(_values)
+            _first_row_ties.append((_smallest, [order for order, value in enumerate(_values) if value == _smallest]))
+    return _row_values
+
+
+class CanonicalForm(NamedTuple):
+    # the canonical puzzle ('0' for blank cells)
+    puzzle: str
+    # the cell of the original puzzle that every cell of the canonical puzzle comes from
+    cells: Tuple[int, ...]
+    # the canonical digit of every original digit (index 0 stays 0)
+    digits: Tuple[int, ...]
+
+    # define a function that maps a grid in the canonical orientation back to the orientation of the original puzzle
+    def original(self, canonical_grid: str) -> str:
+        _inverse: List[int] = [0] * 10
+        for digit, canonical_digit in enumerate(self.digits):
+            _inverse[canonical_digit] = digit
+        _grid: List[str] = ['0'] * 81
+        for index, character in enumerate(canonical_grid):
+            _grid[self.cells[index]] = str(_inverse[int(character)])
+        return ''.join(_grid)
+
+    # define a function that maps a grid in the orientation of the original puzzle to the canonical orientation
+    def canonical(self, original_grid: str) -> str:
+        return ''.join(str(self.digits[int(original_grid[cell])]) for cell in self.cells)
+
+
+# define a function that finds the canonical form of a puzzle, returns None if the puzzle is too symmetric to find
+# the smallest pattern of givens is found first (a breadth first search over the rows, keeping every tied column
+# order), then the tied transforms are told apart by relabeling the digits in order of first appearance
+def canonical_form(puzzle: str) -> Optional[CanonicalForm]:
+    _row_value_table: List[array] = row_values_generate()
+    # create the digits of the puzzle and its transpose, and the givens of every row of both
+    _digits: List[int] = [0 if character == '.' else int(character) for character in puzzle]
+    _grids: Tuple[List[int], List[int]] = (_digits, [_digits[9 * col + row] for row in range(9) for col in range(9)])
+    _row_masks: List[List[int]] = [[sum(1 << col for col in range(9) if grid[9 * row + col]) for row in range(9)]
+                                   for grid in _grids]
+    # create the tied states: the transpose, the rows picked so far, and the column orders still tied
+    # (the first row picks its column orders from the table of first row ties)
+    _first_value: int = min(_first_row_ties[mask][0] for masks in _row_masks for mask in masks)
+    _states: List[Tuple[int, Tuple[int, ...], List[int]]] = [(transpose, (row,), _first_row_ties[mask][1])
+                                                             for transpose in range(2)
+                                                             for row, mask in enumerate(_row_masks[transpose])
+                                                             if _first_row_ties[mask][0] == _first_value]
+    for depth in range(1, 9):
+        _best: int = 512
+        _next_states: List[Tuple[int, Tuple[int, ...], List[int]]] = []
+        for transpose, rows, orders in _states:
+            # a new band can start from any row of an unused band, otherwise the band of the last row goes on
+            if depth % 3 == 0:
+                _used_bands: set = {row // 3 for row in rows}
+                _choices: List[int] = [row for row in range(9) if row // 3 not in _used_bands]
+            else:
+                _choices = [row for row in range(rows[-1] // 3 * 3, rows[-1] // 3 * 3 + 3) if row not in rows]
+            for row in _choices:
+                _mask: int = _row_masks[transpose][row]
+                _values: List[int] = [_row_value_table[order][_mask] for order in orders]
+                _value: int = min(_values)
+                if _value < _best:
+                    _best = _value
+                    _next_states = []
+                if _value == _best:
+                    _next_states.append((transpose, rows + (row,),
+                                         [order for order, value in zip(orders, _values) if value == _value]))
+        _states = _next_states
+        if sum(len(orders) for _, _, orders in _states) > MAX_TIED_TRANSFORMS:
+            return None
+    # relabel the digits of every tied transform and keep the smallest puzzle
+    _best_form: Optional[CanonicalForm] = None
+    for transpose, rows, orders in _states:
+        for order in orders:
+            _cells: Tuple[int, ...] = tuple(9 * row + col if not transpose else 9 * col + row
+                                            for row in rows for col in COLUMN_ORDERS[order])
+            _relabel: List[int] = [0] * 10
+            _next_digit: int = 1
+            _characters: List[str] = []
+            for cell in _cells:
+                _digit: int = _digits[cell]
+                if _digit and not _relabel[_digit]:
+                    _relabel[_digit] = _next_digit
+                    _next_digit += 1
+                _characters.append(str(_relabel[_digit]))
+            _canonical: str = ''.join(_characters)
+            if _best_form is None or _canonical < _best_form.puzzle:
+                # the digits that are not given take the labels left over, in order
+                for digit in range(1, 10):
+                    if not _relabel[digit]:
+                        _relabel[digit] = _next_digit
+                        _next_digit += 1
+                _best_form = CanonicalForm(_canonical, _cells, tuple(_relabel))
+    return _best_form
+
+
+class CachedSolve(NamedTuple):
+    # the solution string (0 for unsolved cells), in the orientation it was asked for
+    solution: str
+    # how the puzzle was finished (logic, search, or none)
+    method: str
+    # the technique log of the solve: the name, placements, and eliminations of every step that changed the board
+    techniques: Tuple[Tuple[str, int, int], ...]
+
+
+class CacheCounters:
+    def __init__(self):
+        # the number of lookups found in memory or on disk, and the number found on disk only
+        self.hits: int = 0
+        self.disk_hits: int = 0
+        # the number of lookups not found, and the number of entries pushed out of memory
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    # define a function that adds the counters of another cache (for example from another worker)
+    def merge(self, other: 'CacheCounters'):
+        self.hits += other.hits
+        self.disk_hits += other.disk_hits
+        self.misses += other.misses
+        self.evictions += other.evictions
+
+    # define a function that returns the counters as a printable string
+    def summary_string(self) -> str:
+        _lookups: int = self.hits + self.misses
+        _rate: float = self.hits / _lookups if _lookups else 0.0
+        return (f'cache hits: {self.hits} ({self.disk_hits} from disk)  misses: {self.misses}  '
+                f'evictions: {self.evictions}  hit rate: {_rate:.1%}')
+
+
+class SolveCache:
+    def __init__(self, capacity: int = 100000, path: Optional[str] = None):
+        # the largest number of entries kept in memory
+        self.capacity: int = capacity
+        # create the in memory entries by canonical puzzle, least recently used first
+        self.entries: 'OrderedDict[str, CachedSolve]' = OrderedDict()
+        # the counters the cache adds to (they can be swapped out to count a single batch)
+        self.counters: CacheCounters = CacheCounters()
+        # create the SQLite store that keeps every entry across restarts, None to keep entries in memory only
+        self.connection: Optional[sqlite3.Connection] = None
+        if path is not None:
+            # several worker processes can share the file, so wait for each other's writes instead of failing
+            self.connection = sqlite3.connect(path, timeout=60)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS solves '
+                                    '(puzzle TEXT PRIMARY KEY, solution TEXT, method TEXT, techniques TEXT)')
+
+    # define a function that keeps an entry in memory as the most recently used, evicting the least recently used
+    def entry_keep(self, canonical_puzzle: str, entry: CachedSolve):
+        self.entries[canonical_puzzle] = entry
+        self.entries.move_to_end(canonical_puzzle)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.counters.evictions += 1
+
+    # define a function that looks up a puzzle by its canonical form, returns the solve in the original orientation
+    # only a solve finished by one of the methods given counts as found (None accepts any method)
+    def lookup(self, form: CanonicalForm, methods: Optional[Collection[str]] = None) -> Optional[CachedSolve]:
+        _entry: Optional[CachedSolve] = self.entries.get(form.puzzle)
+        _from_disk: bool = False
+        if _entry is not None:
+            self.entries.move_to_end(form.puzzle)
+        elif self.connection is not None:
+            _row = self.connection.execute('SELECT solution, method, techniques FROM solves WHERE puzzle = ?',
+                                           (form.puzzle,)).fetchone()
+            if _row is not None:
+                _entry = CachedSolve(_row[0], _row[1], tuple(map(tuple, json.loads(_row[2]))))
+                self.entry_keep(form.puzzle, _entry)
+                _from_disk = True
+        if _entry is None or (methods is not None and _entry.method not in methods):
+            self.counters.misses += 1
+            return None
+        self.counters.hits += 1
+        self.counters.disk_hits += _from_disk
+        return _entry._replace(solution=form.original(_entry.solution))
+
+    # define a function that stores the solve of a puzzle (the solution in the orientation of the original puzzle)
+    def store(self, form: CanonicalForm, solution: str, method: str, techniques: List[Tuple[str, int, int]]):
+        _entry: CachedSolve = CachedSolve(form.canonical(solution), method, tuple(techniques))
+        self.entry_keep(form.puzzle, _entry)
+        if self.connection is not None:
+            self.connection.execute('INSERT OR REPLACE INTO solves VALUES (?, ?, ?, ?)',
+                                    (form.puzzle, _entry.solution, method, json.dumps(_entry.techniques)))
+
+    # define a function that writes the stored entries to disk
+    def flush(self):
+        if self.connection is not None:
+            self.connection.commit()
+
+    # define a function that writes the stored entries to disk and closes the store
+    def close(self):
+        if self.connection is not None:
+            self.connection.commit()
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,41 @@
+# This file contains the solve trace, a compact record of every change each technique step made to a board
+from typing import List, NamedTuple, Tuple
+
+
+class TraceStep(NamedTuple):
+    # the name of the technique that made the step
+    technique: str
+    # every digit placed, as (cell index, digit, candidates mask the cell had before the placement)
+    placements: Tuple[Tuple[int, int, int], ...]
+    # every elimination, as (cell index, mask of the candidates removed)
+    eliminations: Tuple[Tuple[int, int], ...]
+
+
+class SolveTrace:
+    def __init__(self):
+        # the list of finished steps
+        self.steps: List[TraceStep] = []
+        # the changes of the step still being recorded
+        self.placements: List[Tuple[int, int, int]] = []
+        self.eliminations: List[Tuple[int, int]] = []
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __getitem__(self, step: int) -> TraceStep:
+        return self.steps[step]
+
+    # define a function that records a placement in the current step
+    def placement(self, index: int, digit: int, mask: int):
+        self.placements.append((index, digit, mask))
+
+    # define a function that records an elimination in the current step
+    def elimination(self, index: int, mask: int):
+        self.eliminations.append((index, mask))
+
+    # define a function that finishes the current step (steps without any changes are not kept)
+    def step_end(self, technique: str):
+        if self.placements or self.eliminations:
+            self.steps.append(TraceStep(technique, tuple(self.placements), tuple(self.eliminations)))
+            self.placements.clear()
+            self.eliminations.clear()
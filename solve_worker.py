@@ -0,0 +1,116 @@
+# This file contains the worker that solves a board on a background thread, so the Qt event loop keeps running
+import time
+from typing import Optional
+from PySide6.QtCore import QObject, QThread, Signal, Slot
+from board import Board
+
+# the ways a background solve can end
+SOLVE_FINISHED: str = 'finished'
+SOLVE_CANCELLED: str = 'cancelled'
+SOLVE_TIMED_OUT: str = 'timed out'
+SOLVE_FAILED: str = 'failed'
+
+
+class SolveWorker(QObject):
+    # the number of technique steps that changed the board so far, and the technique of the last one
+    progress = Signal(int, str)
+    # how the solve ended (finished, cancelled, timed out, or failed) and whether the board was solved
+    finished = Signal(str, bool)
+
+    def __init__(self, board: Board, timeout: Optional[float] = None):
+        # initialize the parent class
+        super().__init__()
+        # the board to solve (it must not be touched by the GUI thread until the worker has finished)
+        self.board: Board = board
+        # the number of seconds the solve may take, None for no limit
+        self.timeout: Optional[float] = timeout
+        # create the variables for a cancellation request and the time the solve has to stop by
+        self.cancel_requested: bool = False
+        self.deadline: float = 0.0
+        # the number of steps already reported, so progress is only sent when something changes
+        self._reported_steps: int = 0
+        # how the solve ended
+        self.status: str = SOLVE_FINISHED
+
+    # define a function that asks the worker to stop at the next technique call (safe to call from the GUI thread)
+    def cancel(self):
+        self.cancel_requested = True
+
+    # define the function the board calls before every technique call
+    # it reports any new progress and returns True when the solve should stop
+    def stop_check(self) -> bool:
+        _steps: int = len(self.board.technique_log)
+        if _steps != self._reported_steps:
+            self._reported_steps = _steps
+            self.progress.emit(_steps, self.board.technique_log[-1][0])
+        if self.cancel_requested:
+            self.status = SOLVE_CANCELLED
+            return True
+        if self.timeout is not None and time.perf_counter() > self.deadline:
+            self.status = SOLVE_TIMED_OUT
+            return True
+        return False
+
+    @Slot()
+    # define the function that runs on the background thread
+    def run(self):
+        self.deadline = time.perf_counter() + (self.timeout or 0.0)
+        self.board.stop_check = self.stop_check
+        _solved: bool = False
+        try:
+            _solved = self.board.general_solver()
+        except Exception:
+            self.status = SOLVE_FAILED
+            raise
+        finally:
+            # the end is always sent, even if the solve raised, so the controller can stop the thread
+            self.board.stop_check = None
+            self.finished.emit(self.status, _solved)
+
+
+class SolveController(QObject):
+    # the progress and the end of the background solve, sent on the GUI thread
+    progress = Signal(int, str)
+    finished = Signal(str, bool)
+
+    def __init__(self):
+        # initialize the parent class (the controller lives on the GUI thread, so its slots run there)
+        super().__init__()
+        # the background thread and worker of the solve in progress, None when no solve is running
+        self.solve_thread: Optional[QThread] = None
+        self.solve_worker: Optional[SolveWorker] = None
+
+    # define a function that checks whether a solve is running
+    def is_running(self) -> bool:
+        return self.solve_thread is not None
+
+    # define a function that starts solving a board on a new background thread, returns False if one is running
+    def start(self, board: Board, timeout: Optional[float] = None) -> bool:
+        if self.solve_thread is not None:
+            return False
+        self.solve_thread = QThread()
+        self.solve_worker = SolveWorker(board, timeout)
+        self.solve_worker.moveToThread(self.solve_thread)
+        # run the worker once the thread starts, and pass its signals back on to the GUI thread
+        self.solve_thread.started.connect(self.solve_worker.run)
+        self.solve_worker.progress.connect(self.on_worker_progress)
+        self.solve_worker.finished.connect(self.on_worker_finished)
+        self.solve_thread.start()
+        return True
+
+    # define a function that asks the running worker to stop
+    def cancel(self):
+        if self.solve_worker is not None:
+            self.solve_worker.cancel()
+
+    @Slot(int, str)
+    def on_worker_progress(self, steps: int, technique: str):
+        self.progress.emit(steps, technique)
+
+    @Slot(str, bool)
+    def on_worker_finished(self, status: str, solved: bool):
+        # stop the thread and let go of the worker before telling anyone the solve is over
+        self.solve_thread.quit()
+        self.solve_thread.wait()
+        self.solve_thread = self.solve_worker = None
+        self.finished.emit(status, solved)
@@ -0,0 +1,60 @@
+# This file contains the per technique statistics that a board records while solving, when they are turned on
+from typing import Dict
+
+
+class TechniqueStats:
+    # the statistics of a single technique are kept in slots, since one is created per technique per puzzle
+    __slots__ = ('calls', 'seconds', 'placements', 'eliminations')
+
+    def __init__(self):
+        # the number of times the technique ran, and the total wall time it took
+        self.calls: int = 0
+        self.seconds: float = 0.0
+        # the total number of digits placed and candidates eliminated by the technique
+        self.placements: int = 0
+        self.eliminations: int = 0
+
+
+class SolveStats:
+    def __init__(self):
+        # the statistics of every technique that has run, by technique name
+        self.techniques: Dict[str, TechniqueStats] = {}
+        # the number of puzzles the statistics cover
+        self.puzzles: int = 0
+
+    # define the hook the board calls after every technique call
+    def record(self, technique: str, seconds: float, placements: int, eliminations: int):
+        _stats: TechniqueStats = self.techniques.get(technique)
+        if _stats is None:
+            _stats = self.techniques[technique] = TechniqueStats()
+        _stats.calls += 1
+        _stats.seconds += seconds
+        _stats.placements += placements
+        _stats.eliminations += eliminations
+
+    # define a function that adds the statistics of another puzzle (or batch of puzzles) to these statistics
+    def merge(self, other: 'SolveStats'):
+        self.puzzles += other.puzzles
+        for technique, other_stats in other.techniques.items():
+            _stats: TechniqueStats = self.techniques.get(technique)
+            if _stats is None:
+                _stats = self.techniques[technique] = TechniqueStats()
+            _stats.calls += other_stats.calls
+            _stats.seconds += other_stats.seconds
+            _stats.placements += other_stats.placements
+            _stats.eliminations += other_stats.eliminations
+
+    # define a function that returns the statistics as a dictionary (for JSON output)
+    def as_dict(self) -> dict:
+        return {'puzzles': self.puzzles,
+                'techniques': {technique: {slot: getattr(stats, slot) for slot in TechniqueStats.__slots__}
+                               for technique, stats in self.techniques.items()}}
+
+    # define a function that returns the statistics as a printable table
+    def table_string(self) -> str:
+        _lines = [f'{"technique":<28}{"calls":>10}{"ms":>12}{"placed":>10}{"eliminated":>12}']
+        for technique, stats in self.techniques.items():
+            _lines.append(f'{technique:<28}{stats.calls:>10}{stats.seconds * 1000:>12.2f}'
+                          f'{stats.placements:>10}{stats.eliminations:>12}')
+        _lines.append(f'puzzles: {self.puzzles}')
+        return '\n'.join(_lines)